@@ -7,14 +7,17 @@
 # Contact: Kyle Lahnakoski (kyle@lahnakoski.com)
 #
 import re
-from threading import Lock
+from threading import Lock, Thread
 from typing import Mapping
 
 from mo_dots import listwrap, Data, from_data
 
-parse_locker = Lock()  # ENSURE ONLY ONE PARSING AT A TIME
+from mo_sql_parsing.budget import ParseBudgetExceeded, make_budget
+from mo_sql_parsing.cache import ParseCache, freeze
 
-sql_parser = _utils = ansi_string = scrub = None
+parse_locker = Lock()  # ENSURE ONLY ONE THREAD BUILDS A PARSER AT A TIME
+
+sql_parser = _utils = _bulk = ansi_string = scrub = ScrubContext = None
 
 lookup_parsers = {
     "common_parser": {"*": None, None: None},
@@ -23,10 +26,32 @@ lookup_parsers = {
     "bigquery_parser": {"*": None, None: None},
 }
 
+dialect_parsers = {  # MAP FROM DIALECT NAME TO PARSER NAME
+    None: "common_parser",
+    "common": "common_parser",
+    "mysql": "mysql_parser",
+    "sqlserver": "sqlserver_parser",
+    "bigquery": "bigquery_parser",
+}
+
+_pool = None  # (workers, ProcessPoolExecutor) KEPT SO WORKERS KEEP THEIR GRAMMARS
+parse_cache = None  # SEE enable_cache()
+grammar_cache_directory = None  # SEE enable_grammar_cache()
+
 SQL_NULL: Mapping[str, Mapping] = {"null": {}}
 
 
-def parse(sql, null=SQL_NULL, calls=None, all_columns=None, fmap=None):
+def parse(
+    sql,
+    null=SQL_NULL,
+    calls=None,
+    all_columns=None,
+    fmap=None,
+    values_format=None,
+    max_seconds=None,
+    max_steps=None,
+    max_depth=None,
+):
     """
     GENERIC SQL PARSER. CHOSE ANOTHER IF YOU KNOW THE DIALECT
     :param sql: String of SQL
@@ -34,14 +59,27 @@ def parse(sql, null=SQL_NULL, calls=None, all_columns=None, fmap=None):
     :param calls: What to do with function calls (default is the simple_op function `{"op":{}}`)
     :param all_columns: use all_columns="*" for old behaviour (see version 10)
     :param fmap: dict to rename functions
+    :param values_format: use values_format="columnar" for the values of an INSERT as columns
+    :param max_seconds: raise ParseBudgetExceeded if the parse takes longer than this many seconds
+    :param max_steps: raise ParseBudgetExceeded if the parse attempts more than this many expressions and queries
+    :param max_depth: raise ParseBudgetExceeded if expressions and queries nest deeper than this
     :return: parse tree
     """
-    with parse_locker:
-        parser = _get_or_create_parser("common_parser", all_columns)
-        return _parse(parser, sql, null, calls or simple_op, fmap)
-
-
-def parse_mysql(sql, null=SQL_NULL, calls=None, all_columns=None, is_null=None):
+    budget = make_budget(max_seconds, max_steps, max_depth)
+    return _parse_as("common_parser", all_columns, sql, null, calls or simple_op, fmap, values_format, budget)
+
+
+def parse_mysql(
+    sql,
+    null=SQL_NULL,
+    calls=None,
+    all_columns=None,
+    is_null=None,
+    values_format=None,
+    max_seconds=None,
+    max_steps=None,
+    max_depth=None,
+):
     """
     PARSE MySQL ASSUME DOUBLE QUOTED STRINGS ARE LITERALS
     :param sql: String of SQL
@@ -49,14 +87,27 @@ def parse_mysql(sql, null=SQL_NULL, calls=None, all_columns=None, is_null=None):
     :param calls: What to do with function calls (default is the simple_op function `{"op":{}}`)
     :param all_columns: use all_columns="*" for old behaviour (see version 10)
     :param fmap: dict to rename functions
+    :param values_format: use values_format="columnar" for the values of an INSERT as columns
+    :param max_seconds: raise ParseBudgetExceeded if the parse takes longer than this many seconds
+    :param max_steps: raise ParseBudgetExceeded if the parse attempts more than this many expressions and queries
+    :param max_depth: raise ParseBudgetExceeded if expressions and queries nest deeper than this
     :return: parse tree
     """
-    with parse_locker:
-        parser = _get_or_create_parser("mysql_parser", all_columns)
-        return _parse(parser, sql, null, calls or simple_op, is_null)
-
-
-def parse_sqlserver(sql, null=SQL_NULL, calls=None, all_columns=None, is_null=None):
+    budget = make_budget(max_seconds, max_steps, max_depth)
+    return _parse_as("mysql_parser", all_columns, sql, null, calls or simple_op, is_null, values_format, budget)
+
+
+def parse_sqlserver(
+    sql,
+    null=SQL_NULL,
+    calls=None,
+    all_columns=None,
+    is_null=None,
+    values_format=None,
+    max_seconds=None,
+    max_steps=None,
+    max_depth=None,
+):
     """
     PARSE SqlServer ASSUME SQUARE BRACKETS ARE VARIABLE NAMES
     :param sql: String of SQL
@@ -64,14 +115,27 @@ def parse_sqlserver(sql, null=SQL_NULL, calls=None, all_columns=None, is_null=No
     :param calls: What to do with function calls (default is the simple_op function `{"op":{}}`)
     :param all_columns: use all_columns="*" for old behaviour (see version 10)
     :param fmap: dict to rename functions
+    :param values_format: use values_format="columnar" for the values of an INSERT as columns
+    :param max_seconds: raise ParseBudgetExceeded if the parse takes longer than this many seconds
+    :param max_steps: raise ParseBudgetExceeded if the parse attempts more than this many expressions and queries
+    :param max_depth: raise ParseBudgetExceeded if expressions and queries nest deeper than this
     :return: parse tree
     """
-    with parse_locker:
-        parser = _get_or_create_parser("sqlserver_parser", all_columns)
-        return _parse(parser, sql, null, calls or simple_op, is_null)
-
-
-def parse_bigquery(sql, null=SQL_NULL, calls=None, all_columns=None, is_null=None):
+    budget = make_budget(max_seconds, max_steps, max_depth)
+    return _parse_as("sqlserver_parser", all_columns, sql, null, calls or simple_op, is_null, values_format, budget)
+
+
+def parse_bigquery(
+    sql,
+    null=SQL_NULL,
+    calls=None,
+    all_columns=None,
+    is_null=None,
+    values_format=None,
+    max_seconds=None,
+    max_steps=None,
+    max_depth=None,
+):
     """
     PARSE BigQuery ASSUME DOUBLE QUOTED STRINGS ARE LITERALS, AND SQUARE BRACKETS ARE LISTS
     :param sql: String of SQL
@@ -79,38 +143,318 @@ def parse_bigquery(sql, null=SQL_NULL, calls=None, all_columns=None, is_null=Non
     :param calls: What to do with function calls (default is the simple_op function `{"op":{}}`)
     :param all_columns: use all_columns="*" for old behaviour (see version 10)
     :param fmap: dict to rename functions
+    :param values_format: use values_format="columnar" for the values of an INSERT as columns
+    :param max_seconds: raise ParseBudgetExceeded if the parse takes longer than this many seconds
+    :param max_steps: raise ParseBudgetExceeded if the parse attempts more than this many expressions and queries
+    :param max_depth: raise ParseBudgetExceeded if expressions and queries nest deeper than this
     :return: parse tree
     """
+    budget = make_budget(max_seconds, max_steps, max_depth)
+    return _parse_as("bigquery_parser", all_columns, sql, null, calls or simple_op, is_null, values_format, budget)
+
+
+def enable_cache(size=1000, templates=False):
+    """
+    KEEP THE size MOST RECENTLY USED PARSE RESULTS, KEYED BY DIALECT, OPTIONS AND SQL
+    :param size: Maximum number of parse trees to keep
+    :param templates: True to key on the SQL with its literals removed, and bind the literals into the cached tree
+    :return: the ParseCache, with hits, misses and evictions counters
+    """
+    global parse_cache
+    if templates:
+        from mo_sql_parsing.templates import TemplateCache
+
+        parse_cache = TemplateCache(size)
+    else:
+        parse_cache = ParseCache(size)
+    return parse_cache
+
+
+def disable_cache():
+    global parse_cache
+    parse_cache = None
+
+
+def enable_grammar_cache(directory=None):
+    """
+    KEEP BUILT PARSERS ON DISK, SO LATER PROCESSES LOAD THEM INSTEAD OF BUILDING THEM
+    CALL BEFORE THE FIRST parse()
+    :param directory: where to keep the files (default is $XDG_CACHE_HOME/mo_sql_parsing, or ~/.cache/mo_sql_parsing)
+    :return: the directory
+    """
+    global grammar_cache_directory
+    import os
+
+    if directory is None:
+        directory = os.path.join(
+            os.environ.get("XDG_CACHE_HOME") or os.path.join(os.path.expanduser("~"), ".cache"), "mo_sql_parsing",
+        )
+    grammar_cache_directory = directory
+    return directory
+
+
+def disable_grammar_cache():
+    global grammar_cache_directory
+    grammar_cache_directory = None
+
+
+def warmup(dialects=("common",), all_columns=(None, "*"), background=True):
+    """
+    BUILD PARSERS AHEAD OF TIME, SO THE FIRST parse() DOES NOT PAY FOR IT
+    :param dialects: Iterable of "common", "mysql", "sqlserver", "bigquery"
+    :param all_columns: Iterable of all_columns values to build for (None and/or "*")
+    :param background: True to build on a daemon thread
+    :return: Future; result() waits for the build, and returns the list of (dialect, all_columns) built
+    """
+    from concurrent.futures import Future
+
+    todo = []
+    for dialect in dialects:
+        if dialect not in dialect_parsers:
+            raise Exception(f"Expecting dialect to be one of {', '.join(str(d) for d in dialect_parsers)}")
+        for columns in all_columns:
+            if columns not in (None, "*"):
+                raise Exception("Expecting all_columns to be None or '*'")
+            todo.append((dialect, columns))
+
+    done = Future()
+
+    def build():
+        if not done.set_running_or_notify_cancel():
+            return
+        try:
+            for dialect, columns in todo:
+                parser = _get_or_create_parser(dialect_parsers[dialect], columns)
+                # FIRST PARSE ALSO PREPARES STATE THE GRAMMAR ONLY MAKES WHEN USED
+                result = _parse(parser, "select 1", SQL_NULL, simple_op, None)
+                if result != {"select": {"value": 1}}:
+                    raise Exception(f"Parser for {dialect} failed self-check")
+            done.set_result(todo)
+        except Exception as cause:
+            done.set_exception(cause)
+
+    if background:
+        Thread(target=build, name="mo-sql-parsing warmup", daemon=True).start()
+    else:
+        build()
+    return done
+
+
+def profile():
+    """
+    COUNT MATCH ATTEMPTS, MATCHES, FAILURES AND TIME FOR EACH NAMED GRAMMAR RULE, WHILE IN THE with BLOCK
+
+        with mo_sql_parsing.profile() as p:
+            parse(sql)
+        print(p.report())
+
+    :return: Profile; use report() for a table of the rules, most time first, or to_json() for all of it
+    """
+    from mo_sql_parsing.profiling import Profile
+
+    return Profile()
+
+
+def parse_many(
+    sqls,
+    dialect=None,
+    workers=None,
+    chunksize=64,
+    null=SQL_NULL,
+    calls=None,
+    all_columns=None,
+    fmap=None,
+    values_format=None,
+):
+    """
+    PARSE MANY SQL STRINGS ACROSS A POOL OF WORKER PROCESSES
+    :param sqls: Iterable of SQL strings
+    :param dialect: One of "common", "mysql", "sqlserver", "bigquery" (default is "common")
+    :param workers: Number of worker processes (default is cpu count); workers=1 parses in this process
+    :param chunksize: Number of statements sent to a worker at a time
+    :param null: What value to use as NULL (default is the null function `{"null":{}}`)
+    :param calls: What to do with function calls (default is the simple_op function `{"op":{}}`); must be picklable
+    :param all_columns: use all_columns="*" for old behaviour (see version 10)
+    :param fmap: dict to rename functions
+    :param values_format: use values_format="columnar" for the values of an INSERT as columns
+    :return: list of parse trees, in input order; a statement that fails to parse gets its Exception instead
+    """
+    global _pool
+    if dialect not in dialect_parsers:
+        raise Exception(f"Expecting dialect to be one of {', '.join(str(d) for d in dialect_parsers)}")
+    _check_values_format(values_format)
+    params = (dialect_parsers[dialect], null, calls or simple_op, all_columns, fmap, values_format)
+
+    if workers == 1:
+        return [_parse_one(sql, params) for sql in sqls]
+
+    from concurrent.futures import ProcessPoolExecutor
+    from functools import partial
+    import os
+
+    workers = workers or os.cpu_count() or 1
     with parse_locker:
-        parser = _get_or_create_parser("bigquery_parser", all_columns)
-        return _parse(parser, sql, null, calls or simple_op, is_null)
+        if not _pool or _pool[0] != workers:
+            if _pool:
+                _pool[1].shutdown()
+            _pool = (workers, ProcessPoolExecutor(workers))
+        pool = _pool[1]
+    return list(pool.map(partial(_parse_one, params=params), sqls, chunksize=chunksize))
+
+
+def parse_stream(
+    source,
+    dialect=None,
+    null=SQL_NULL,
+    calls=None,
+    all_columns=None,
+    fmap=None,
+    chunk_size=1 << 16,
+    values_format=None,
+):
+    """
+    PARSE SQL STATEMENTS AS THEY ARE READ, SO ONLY ONE STATEMENT IS KEPT IN MEMORY
+    STATEMENTS ARE SPLIT ON THE DELIMITER, WHICH DELIMITER COMMANDS CAN CHANGE (SEE parse_delimiters())
+    :param source: File object (text or binary), iterable of str pieces (eg lines), or str
+    :param dialect: One of "common", "mysql", "sqlserver", "bigquery" (default is "common")
+    :param null: What value to use as NULL (default is the null function `{"null":{}}`)
+    :param calls: What to do with function calls (default is the simple_op function `{"op":{}}`)
+    :param all_columns: use all_columns="*" for old behaviour (see version 10)
+    :param fmap: dict to rename functions
+    :param chunk_size: Amount to read from a file object at a time
+    :param values_format: use values_format="columnar" for the values of an INSERT as columns
+    :return: generator of (statement_index, (start, end), tree), where start and end are character offsets
+             into the source; a statement that fails to parse gets its Exception instead of a tree
+    """
+    if dialect not in dialect_parsers:
+        raise Exception(f"Expecting dialect to be one of {', '.join(str(d) for d in dialect_parsers)}")
+    _check_values_format(values_format)
+    return _parse_stream(
+        source, dialect_parsers[dialect], null, calls or simple_op, all_columns, fmap, chunk_size, values_format
+    )
+
+
+def _parse_stream(source, parser_name, null, calls, all_columns, fmap, chunk_size, values_format):
+    from mo_sql_parsing.statements import StatementSplitter, read_pieces
+
+    splitter = StatementSplitter()
+    index = 0
+    for statements in _chain_close(splitter, read_pieces(source, chunk_size)):
+        for start, end, sql in statements:
+            try:
+                tree = _parse_as(parser_name, all_columns, sql, null, calls, fmap, values_format)
+            except Exception as cause:
+                tree = cause
+            if tree is None:
+                # ONLY COMMENTS
+                continue
+            yield index, (start, end), tree
+            index += 1
+
+
+def _chain_close(splitter, pieces):
+    for piece in pieces:
+        yield splitter.feed(piece)
+    yield splitter.close()
+
+
+def _parse_one(sql, params):
+    parser_name, null, calls, all_columns, fmap, values_format = params
+    try:
+        parser = _get_or_create_parser(parser_name, all_columns)
+        return _parse(parser, sql, null, calls, fmap, values_format)
+    except Exception as cause:
+        # mo-parsing EXCEPTIONS DO NOT PICKLE, SO SEND BACK THE MESSAGE
+        return Exception(str(cause))
 
 
 def _get_or_create_parser(parser_name, all_columns=None):
-    global sql_parser, _utils, ansi_string, scrub
+    global sql_parser, _utils, _bulk, ansi_string, scrub, ScrubContext
     try:
         parser = lookup_parsers[parser_name][all_columns]
-        if not parser:
-            from mo_sql_parsing import sql_parser, utils as _utils
-            from mo_sql_parsing.sql_parser import scrub
-            from mo_sql_parsing.utils import ansi_string
-
-            parser = lookup_parsers[parser_name][all_columns] = getattr(sql_parser, parser_name)(all_columns)
+        if parser:
+            return parser
+        with parse_locker:
+            # GRAMMAR CONSTRUCTION USES mo-parsing GLOBAL STATE (WHITESPACE STACK), SO BUILD ONE AT A TIME
+            parser = lookup_parsers[parser_name][all_columns]
+            if not parser:
+                from mo_sql_parsing import sql_parser, utils as _utils, bulk as _bulk
+                from mo_sql_parsing.sql_parser import scrub
+                from mo_sql_parsing.utils import ansi_string, ScrubContext
+
+                parser = lookup_parsers[parser_name][all_columns] = _build_parser(parser_name, all_columns)
         return parser
     except Exception as cause:
         raise Exception("Expecting all_columns to be None or '*'") from cause
 
 
-def _parse(parser, sql, null, calls, fmap):
+def _build_parser(parser_name, all_columns):
+    directory = grammar_cache_directory
+    if directory is None:
+        return getattr(sql_parser, parser_name)(all_columns)
+
+    from mo_sql_parsing import grammar_cache
+
+    filename = grammar_cache.cache_file(directory, parser_name, all_columns)
+    parser = grammar_cache.load(filename)
+    if parser is None:
+        parser = getattr(sql_parser, parser_name)(all_columns)
+        try:
+            grammar_cache.save(filename, parser)
+        except Exception:
+            # A CACHE WE CAN NOT WRITE ONLY COSTS US THE SPEED
+            pass
+    return parser
+
+
+def _parse_as(parser_name, all_columns, sql, null, calls, fmap, values_format=None, budget=None):
+    _check_values_format(values_format)
+
+    def parse_sql(sql):
+        parser = _get_or_create_parser(parser_name, all_columns)
+        if budget is None:
+            return _parse(parser, sql, null, calls, fmap, values_format)
+        # BUILDING THE PARSER DOES NOT COUNT AGAINST THE BUDGET
+        with budget:
+            return _parse(parser, sql, null, calls, fmap, values_format)
+
+    cache = parse_cache
+    if cache is None:
+        return parse_sql(sql)
+
+    try:
+        options = (parser_name, all_columns, freeze(null), calls, freeze(fmap), values_format)
+        hash(options)
+    except TypeError:
+        # UNHASHABLE null, SO DO NOT CACHE
+        return parse_sql(sql)
+    return cache.parse(options, sql, parse_sql)
+
+
+def _check_values_format(values_format):
+    if values_format not in (None, "columnar"):
+        raise Exception('Expecting values_format to be None or "columnar"')
+
+
+def _parse(parser, sql, null, calls, fmap, values_format=None):
+    def parse_statement(line, calls=calls):
+        context = ScrubContext(calls, fmap, null)
+        with context:
+            # Parser.parse_string() HOLDS mo_parsing.core.locker TO RUN mo_parsing.core._reset_actions: THE
+            # num_captures OF mo_parsing.regex (USED ONLY WHILE A Regex IS BUILT, WHICH IS GRAMMAR CONSTRUCTION,
+            # UNDER parse_locker) AND THE INDENT STACK OF mo_parsing.helpers (NOT USED BY THIS GRAMMAR). CALLING
+            # THE PRIVATE Parser._parseString() SKIPS BOTH; tests/test_threads.py CHECKS THESE INTERNALS, AND
+            # packaging/requirements.txt PINS THE mo-parsing VERSIONS THEY WERE CHECKED ON
+            parse_result = parser._parseString(line, parse_all=True)
+        return scrub(parse_result, context)
+
+    columnar = values_format == "columnar"
+    insert_calls = _bulk.columnar_calls(calls, fmap) if columnar else calls
     acc = []
     for line in parse_delimiters(sql):
-        _utils.null_locations = []
-        _utils.scrub_op = calls
-        _utils.fmap = fmap or {}
-        parse_result = parser.parse_string(line, parse_all=True)
-        output = scrub(parse_result)
-        for o, n in _utils.null_locations:
-            o[n] = null
+        output = _bulk.parse_insert(line, parse_statement, columnar)
+        if output is None:
+            output = parse_statement(line, insert_calls)
         if not output:
             continue
         if isinstance(output, list):
@@ -158,34 +502,115 @@ delimiter_pattern = re.compile(r"^\s*delimiter\s+([^\n]+)$", re.IGNORECASE | re.
 
 
 def parse_delimiters(sql, ignore=";"):
+    """
+    SPLIT sql ON DELIMITER COMMANDS, AND ON THE DELIMITER THEY SET
+    :param sql: String of SQL
+    :param ignore: Delimiter to leave for the parser to split on
+    :return: generator of strings; each delimiter command is yielded too
+    """
+    for start, end in delimiter_spans(sql, ignore):
+        yield sql[start:end]
+
+
+def delimiter_spans(sql, ignore=";"):
+    """
+    SAME AS parse_delimiters(), BUT YIELDS (start, end) OFFSETS INTO sql, SO NOTHING IS COPIED
+    """
     delimiter = ";"
-    ender = r"\s*(\n|$)"
-    splitter = re.compile(re.escape(delimiter) + ender)
+    splitter = _splitter(delimiter)
+    position, length = 0, len(sql)
 
     while True:
-        found = delimiter_pattern.search(sql)
-        if found:
-            block, sql = sql[: found.start()], sql[found.end() :]
-            block = block.strip()
-        else:
-            block = sql.strip()
+        found = delimiter_pattern.search(sql, position)
+        start, end = _strip(sql, position, found.start() if found else length)
 
-        if block:
+        if start < end:
             if delimiter == ignore:
-                yield block
+                yield start, end
             else:
                 while True:
-                    inner_found = splitter.search(block)
+                    inner_found = splitter.search(sql, start, end)
                     if not inner_found:
-                        yield block
+                        yield start, end
                         break
-                    yield block[: inner_found.start()]
-                    block = block[inner_found.end() :]
+                    yield start, inner_found.start()
+                    start = inner_found.end()
         if not found:
             break
-        yield found.group(0)
+        yield found.start(), found.end()
         delimiter = found.group(1).strip()
-        splitter = re.compile(re.escape(delimiter) + ender)
+        splitter = _splitter(delimiter)
+        position = found.end()
+
+
+def split_statements(sql):
+    """
+    SPLIT sql INTO STATEMENTS, WITHOUT PARSING THEM
+    DOES NOT SPLIT INSIDE QUOTES, COMMENTS, OR BEGIN/END BLOCKS, AND FOLLOWS DELIMITER COMMANDS
+    :param sql: String of SQL
+    :return: list of statements, without their delimiters; each delimiter command is a statement too
+    """
+    from mo_sql_parsing.statements import StatementSplitter
+
+    splitter = StatementSplitter()
+    statements = splitter.feed(sql)
+    statements.extend(splitter.close())
+    return [statement for _, _, statement in statements]
+
 
+def tokenize(sql, dialect=None):
+    """
+    SPLIT sql INTO TOKENS, WITHOUT PARSING
+    :param sql: String of SQL
+    :param dialect: None, "common", "mysql", "sqlserver" or "bigquery"; decides if "x" and [x] are identifiers or strings
+    :return: list of (kind, start, end); kind is one of "word", "identifier", "string", "number", "symbol"
+    """
+    from mo_sql_parsing import lexer
+
+    if dialect not in dialect_parsers:
+        raise Exception(f"Expecting dialect to be one of {', '.join(str(d) for d in dialect_parsers)}")
+    return lexer.tokenize(sql, dialect_parsers[dialect])
+
+
+_splitters = {}  # MAP FROM DELIMITER TO COMPILED PATTERN
 
-__all__ = ["parse", "format", "parse_mysql", "parse_sqlserver", "parse_bigquery", "normal_op", "simple_op", "SQL_NULL"]
+
+def _splitter(delimiter):
+    splitter = _splitters.get(delimiter)
+    if not splitter:
+        splitter = _splitters[delimiter] = re.compile(re.escape(delimiter) + r"\s*(\n|$)")
+    return splitter
+
+
+def _strip(sql, start, end):
+    """
+    :return: (start, end) WITHOUT THE WHITESPACE AT EITHER END
+    """
+    while start < end and sql[start].isspace():
+        start += 1
+    while start < end and sql[end - 1].isspace():
+        end -= 1
+    return start, end
+
+
+__all__ = [
+    "parse",
+    "format",
+    "parse_mysql",
+    "parse_sqlserver",
+    "parse_bigquery",
+    "parse_many",
+    "parse_stream",
+    "split_statements",
+    "tokenize",
+    "enable_cache",
+    "disable_cache",
+    "enable_grammar_cache",
+    "disable_grammar_cache",
+    "warmup",
+    "profile",
+    "normal_op",
+    "simple_op",
+    "SQL_NULL",
+    "ParseBudgetExceeded",
+]
@@ -0,0 +1,224 @@
+# encoding: utf-8
+#
+# This Source Code Form is subject to the terms of the Mozilla Public
+# License, v. 2.0. If a copy of the MPL was not distributed with this file,
+# You can obtain one at http://mozilla.org/MPL/2.0/.
+#
+# Contact: Kyle Lahnakoski (kyle@lahnakoski.com)
+#
+"""
+PARSE SQL FILES, OR STDIN, INTO ONE JSON LINE PER STATEMENT
+
+    python -m mo_sql_parsing [--dialect mysql] [--workers 4] [--max-seconds 10] [file.sql | file.sql.gz | file.sql.zst | -] ...
+"""
+import argparse
+import codecs
+import gzip
+import io
+import json
+import os
+import sys
+from collections import deque
+from contextlib import contextmanager
+from time import perf_counter
+
+from mo_sql_parsing import parse, parse_mysql, parse_sqlserver, parse_bigquery
+from mo_sql_parsing.statements import StatementSplitter
+
+PARSERS = {"common": parse, "mysql": parse_mysql, "sqlserver": parse_sqlserver, "bigquery": parse_bigquery}
+MAX_SIZE = 10_000_000  # DEFAULT CHARACTERS IN ONE STATEMENT
+GZIP_MAGIC = b"\x1f\x8b"
+ZSTD_MAGIC = b"\x28\xb5\x2f\xfd"
+
+
+@contextmanager
+def open_source(name):
+    """
+    :param name: file name, or "-" for stdin
+    :return: context of a binary file object of the uncompressed content; gzip and zstandard are detected
+             from the first bytes
+    """
+    raw = sys.stdin.buffer if name == "-" else open(name, "rb")
+    try:
+        if not hasattr(raw, "peek"):
+            raw = io.BufferedReader(raw)
+        head = raw.peek(4)[:4]
+        if head.startswith(GZIP_MAGIC):
+            yield gzip.GzipFile(fileobj=raw)
+        elif head == ZSTD_MAGIC:
+            try:
+                import zstandard
+            except ImportError as cause:
+                raise Exception(f"Expecting zstandard to be installed to read {name}") from cause
+            yield zstandard.ZstdDecompressor().stream_reader(raw, read_across_frames=True, closefd=False)
+        else:
+            yield raw
+    finally:
+        if name != "-":
+            raw.close()
+
+
+def read_statements(file, chunk_size=1 << 20, max_size=MAX_SIZE):
+    """
+    SPLIT file INTO STATEMENTS AS IT IS READ, FOLLOWING DELIMITER COMMANDS LIKE parse_delimiters()
+    (SEE StatementSplitter)
+    :param file: binary file object
+    :param chunk_size: bytes to read at a time
+    :param max_size: characters one statement may have; a longer one is dropped, so memory stays bounded
+    :return: generator of (byte offset, statement); the offset is into the uncompressed content, and the
+             statement is None if it was dropped
+    """
+    # BYTES THAT ARE NOT UTF8 SURVIVE AS SURROGATES, SO THEY STILL COUNT AS ONE BYTE EACH
+    decoder = codecs.getincrementaldecoder("utf8")("surrogateescape")
+    splitter = StatementSplitter(max_size=max_size)
+    pieces = deque()  # (char offset, byte offset, text) OF THE TEXT THAT STATEMENTS MAY STILL START IN
+    chars = total = 0  # CHARACTERS, AND BYTES, DECODED SO FAR
+    cursor_char = cursor_byte = 0  # LAST STATEMENT START, SO EACH BYTE IS ENCODED ONLY ONCE
+    while True:
+        chunk = file.read(chunk_size)
+        text = decoder.decode(chunk, final=not chunk)
+        if text:
+            pieces.append((chars, total, text))
+            chars += len(text)
+            total += len(text.encode("utf8", "surrogateescape"))
+        statements = splitter.feed(text)
+        if not chunk:
+            statements.extend(splitter.close())
+        for start, _, sql in statements:
+            while len(pieces) > 1 and pieces[1][0] <= start:
+                pieces.popleft()
+                cursor_char, cursor_byte, _ = pieces[0]
+            char_offset, _, piece = pieces[0]
+            cursor_byte += len(piece[cursor_char - char_offset : start - char_offset].encode("utf8", "surrogateescape"))
+            cursor_char = start
+            yield cursor_byte, sql
+        if not chunk:
+            return
+
+
+def parse_batch(batch, params):
+    """
+    :param batch: list of SQL statements; None for a statement that was dropped
+    :param params: (dialect, max_seconds, max_size)
+    :return: list of (tree, error, seconds), one per statement
+    """
+    dialect, max_seconds, max_size = params
+    parser = PARSERS[dialect]
+    parser("select 1")  # BUILD THE GRAMMAR FIRST, IT IS NOT PARSE TIME
+    output = []
+    for sql in batch:
+        if sql is None:
+            output.append((None, f"Statement is over {max_size} characters, so it was skipped", 0))
+            continue
+        start = perf_counter()
+        try:
+            tree, error = parser(sql, max_seconds=max_seconds), None
+        except Exception as cause:
+            tree, error = None, str(cause)
+        output.append((tree, error, perf_counter() - start))
+    return output
+
+
+def _batches(names, batch_size, max_size):
+    batch = []
+    for name in names:
+        with open_source(name) as file:
+            for offset, sql in read_statements(file, max_size=max_size):
+                batch.append((name, offset, sql))
+                if len(batch) >= batch_size:
+                    yield batch
+                    batch = []
+    if batch:
+        yield batch
+
+
+def run(
+    names, dialect="common", workers=1, batch_size=64, window=None, max_seconds=None, max_size=MAX_SIZE, output=None
+):
+    """
+    :param names: list of file names; "-" is stdin
+    :param dialect: One of "common", "mysql", "sqlserver", "bigquery" (default is "common")
+    :param workers: Number of worker processes; workers=1 parses in this process
+    :param batch_size: Number of statements sent to a worker at a time
+    :param window: Number of batches in flight (default 4 per worker); results wait here to be written in order
+    :param max_seconds: Seconds one statement may take to parse
+    :param max_size: Characters one statement may have; a longer one is written as an error, and skipped
+    :param output: text file to write the JSON lines to (default stdout)
+    :return: number of statements written
+    """
+    if dialect not in PARSERS:
+        raise Exception(f"Expecting dialect to be one of {', '.join(PARSERS)}")
+    output = output or sys.stdout
+    params = (dialect, max_seconds, max_size)
+    index = 0
+
+    def write(batch, results):
+        nonlocal index
+        for (name, offset, _), (tree, error, seconds) in zip(batch, results):
+            if tree is None and error is None:
+                # ONLY COMMENTS
+                continue
+            record = {"file": name, "index": index, "offset": offset, "seconds": round(seconds, 6)}
+            if error is None:
+                record["tree"] = tree
+            else:
+                record["error"] = error
+            output.write(json.dumps(record, default=str))
+            output.write("\n")
+            index += 1
+
+    if workers == 1:
+        for batch in _batches(names, batch_size, max_size):
+            write(batch, parse_batch([sql for _, _, sql in batch], params))
+        return index
+
+    from concurrent.futures import ProcessPoolExecutor
+
+    window = window or 4 * workers
+    pending = deque()  # (batch, future) IN INPUT ORDER; THE BOUNDED REORDER BUFFER
+    with ProcessPoolExecutor(workers) as pool:
+        for batch in _batches(names, batch_size, max_size):
+            pending.append((batch, pool.submit(parse_batch, [sql for _, _, sql in batch], params)))
+            if len(pending) >= window:
+                batch, future = pending.popleft()
+                write(batch, future.result())
+        while pending:
+            batch, future = pending.popleft()
+            write(batch, future.result())
+    return index
+
+
+def main(args):
+    options = argparse.ArgumentParser(prog="python -m mo_sql_parsing", description=__doc__.strip().splitlines()[0])
+    options.add_argument("files", nargs="*", default=["-"], help="SQL files, plain, gzip or zstandard; - is stdin")
+    options.add_argument("--dialect", default="common", choices=list(PARSERS))
+    options.add_argument("--workers", type=int, default=os.cpu_count() or 1, help="worker processes (default cpu count)")
+    options.add_argument("--batch-size", type=int, default=64, help="statements sent to a worker at a time")
+    options.add_argument("--window", type=int, help="batches in flight (default 4 per worker)")
+    options.add_argument("--max-seconds", type=float, help="seconds one statement may take to parse")
+    options.add_argument(
+        "--max-size", type=int, default=MAX_SIZE, help=f"characters one statement may have (default {MAX_SIZE:,})"
+    )
+    options = options.parse_args(args)
+    if (
+        options.workers < 1
+        or options.batch_size < 1
+        or options.max_size < 1
+        or (options.window is not None and options.window < 1)
+    ):
+        raise Exception("Expecting --workers, --batch-size, --window and --max-size to be positive")
+
+    run(
+        options.files,
+        dialect=options.dialect,
+        workers=options.workers,
+        batch_size=options.batch_size,
+        window=options.window,
+        max_seconds=options.max_seconds,
+        max_size=options.max_size,
+    )
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
@@ -0,0 +1,93 @@
+# encoding: utf-8
+#
+# This Source Code Form is subject to the terms of the Mozilla Public
+# License, v. 2.0. If a copy of the MPL was not distributed with this file,
+# You can obtain one at http://mozilla.org/MPL/2.0/.
+#
+# Contact: Kyle Lahnakoski (kyle@lahnakoski.com)
+#
+from math import inf
+from threading import local
+from time import perf_counter
+
+
+class ParseBudgetExceeded(Exception):
+    """
+    RAISED WHEN A PARSE TAKES MORE TIME, STEPS, OR NESTING, THAN ALLOWED
+    NOT A ParseException, SO THE GRAMMAR DOES NOT BACKTRACK OVER IT
+    """
+
+    def __init__(self, limit, value, loc):
+        """
+        :param limit: name of the limit, one of "max_seconds", "max_steps", "max_depth"
+        :param value: the limit that was exceeded
+        :param loc: character offset the parse was at
+        """
+        Exception.__init__(self, f"Parse exceeded {limit}={value} (at char {loc})")
+        self.limit = limit
+        self.value = value
+        self.loc = loc
+
+
+class Budget(object):
+    """
+    LIMITS FOR ONE CALL TO parse(), CHECKED EACH TIME THE GRAMMAR STARTS AN EXPRESSION OR QUERY
+    """
+
+    __slots__ = ["max_seconds", "max_steps", "max_depth", "deadline", "steps", "depth", "previous"]
+
+    def __init__(self, max_seconds=None, max_steps=None, max_depth=None):
+        """
+        :param max_seconds: wall-clock seconds the parse may take
+        :param max_steps: number of expressions, and queries, the parse may attempt, including the ones it backtracks over
+        :param max_depth: how deep expressions, and queries, may nest
+        """
+        self.max_seconds = inf if max_seconds is None else max_seconds
+        self.max_steps = inf if max_steps is None else max_steps
+        self.max_depth = inf if max_depth is None else max_depth
+        self.deadline = inf
+        self.steps = 0
+        self.depth = 0
+        self.previous = None
+
+    def __enter__(self):
+        self.deadline = perf_counter() + self.max_seconds
+        self.steps = 0
+        self.depth = 0
+        self.previous = state.budget
+        state.budget = self
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        state.budget = self.previous
+        self.previous = None
+
+    def enter(self, loc):
+        self.steps += 1
+        self.depth += 1
+        if self.steps > self.max_steps:
+            raise ParseBudgetExceeded("max_steps", self.max_steps, loc)
+        if self.depth > self.max_depth:
+            raise ParseBudgetExceeded("max_depth", self.max_depth, loc)
+        if perf_counter() > self.deadline:
+            raise ParseBudgetExceeded("max_seconds", self.max_seconds, loc)
+
+
+class _State(local):
+    budget = None  # THE Budget OF THE PARSE RUNNING ON THIS THREAD
+
+
+state = _State()
+
+
+def make_budget(max_seconds=None, max_steps=None, max_depth=None):
+    """
+    :return: Budget, or None if there are no limits
+    """
+    if max_seconds is None and max_steps is None and max_depth is None:
+        return None
+    for name, value in (("max_seconds", max_seconds), ("max_steps", max_steps), ("max_depth", max_depth)):
+        if value is not None and not value > 0:
+            raise Exception(f"Expecting {name} to be a positive number")
+    return Budget(max_seconds, max_steps, max_depth)
+
@@ -0,0 +1,312 @@
+# encoding: utf-8
+#
+# This Source Code Form is subject to the terms of the Mozilla Public
+# License, v. 2.0. If a copy of the MPL was not distributed with this file,
+# You can obtain one at http://mozilla.org/MPL/2.0/.
+#
+# Contact: Kyle Lahnakoski (kyle@lahnakoski.com)
+#
+import re
+from itertools import zip_longest
+
+from mo_parsing import Empty, Group
+from mo_parsing.enhancement import ParseEnhancement
+from mo_parsing.results import ParseResults
+from mo_parsing.utils import wrap_parse_action
+
+from mo_sql_parsing.lexer import CHARSET, INT, QUOTES, REAL
+from mo_sql_parsing.utils import single_literal, double_literal, get_literal, parse_int, to_tuple_call
+
+MIN_ROWS = 16  # SMALLER INSERTS ARE NOT WORTH THE PROBE PARSE
+MIN_ITEMS = 2  # A SINGLE ITEM IN () IS LEFT TO THE GRAMMAR
+numpy = None  # IMPORTED ON FIRST USE, False IF NOT INSTALLED
+
+_ws = r"[ \t\r\n]*"
+_header = re.compile(
+    _ws + r"insert\b(?:`[^`]*`|[^'\"`;#/-])*?\bvalues" + _ws + r"(?=\()", re.IGNORECASE,
+)
+_open = re.compile(_ws + r"\(")
+_more = re.compile(_ws + r",")
+_value = re.compile(
+    _ws
+    + "(?:"
+    + "|".join([
+        "(?P<single>" + CHARSET + "'" + QUOTES["'"][0] + "')",
+        '(?P<double>"' + QUOTES['"'][0] + '")',
+        f"(?P<real>{REAL})",
+        f"(?P<int>{INT})",
+        r"(?P<true>[Tt][Rr][Uu][Ee])",
+    ])
+    + ")"
+    + _ws
+    + r"(?P<end>[,)])"
+)
+
+# ONLY THE LITERALS THAT PARSE THE SAME IN EVERY DIALECT: UNSIGNED NUMBERS AND PLAIN 'strings'
+_item = re.compile(
+    _ws
+    + "(?:"
+    + "|".join([
+        r"'(?P<single>(?:''|[^'\\\r])*)'",
+        f"(?P<real>{REAL})",
+        f"(?P<int>{INT})",
+    ])
+    + ")"
+    + _ws
+    + r"(?P<end>[,)])"
+)
+_tuple_group = Group(Empty())
+_tuple_call = wrap_parse_action(to_tuple_call)
+
+
+class LiteralTuple(ParseEnhancement):
+    """
+    FAST PATH FOR A HUGE IN (...) LIST OF LITERALS (eg GENERATED QUERIES)
+
+    SAME AS expr, WHICH IS (LB + Group(delimited_list(expression)) / to_tuple_call + RB), BUT
+    A LIST OF PLAIN LITERALS IS LEXED DIRECTLY, NOT PARSED AS AN expression PER ITEM
+    """
+
+    __slots__ = []
+
+    def parse_impl(self, string, start, do_actions=True):
+        found = _lex_tuple(string, start)
+        if not found:
+            return ParseEnhancement.parse_impl(self, string, start, do_actions)
+        values, end = found
+        # THE SAME TOKENS THE Group WOULD HAVE: NUMBERS, AND {"literal": value} FOR STRINGS
+        result = _tuple_call(ParseResults(_tuple_group, start, end, values, []), start, string)
+        return ParseResults(self, start, end, [result], [])
+
+
+def _lex_tuple(sql, start):
+    """
+    :return: (values, end) FOR A PARENTHESIZED LIST OF AT LEAST MIN_ITEMS LITERALS AT start, OR None
+    """
+    if sql[start : start + 1] != "(":
+        return None
+    values = []
+    append, match_item = values.append, _item.match
+    position = start + 1
+    while True:
+        found = match_item(sql, position)
+        if not found:
+            return None
+        position = found.end()
+        single, real, integer, end = found.groups()
+        try:
+            if integer:
+                append(parse_int([integer]))
+            elif real:
+                append(float(real))
+            else:
+                append({"literal": single.replace("''", "'")})
+        except Exception:
+            return None
+        if end == ")":
+            break
+    if len(values) < MIN_ITEMS:
+        return None
+    return values, position
+
+
+def parse_insert(sql, parse, columnar=False):
+    """
+    FAST PATH FOR INSERT ... VALUES WITH MANY ROWS OF LITERALS (eg mysqldump)
+
+    THE ROWS ARE SCANNED WITH A LITERAL LEXER.  THE HEADER, THE FIRST ROW, THE
+    LAST ROW, AND ANY DIALECT-SENSITIVE ROW ARE PARSED BY THE FULL GRAMMAR AS A
+    PROBE; IF THE LEXER AGREES WITH THE PROBE, THE PROBE'S VALUES ARE REPLACED
+    WITH ALL THE LEXED ROWS
+
+    :param sql: one statement
+    :param parse: function to parse (and scrub) one statement with the full grammar
+    :param columnar: True to emit the values as columns (see to_columns())
+    :return: parse tree, or None if the fast path does not apply
+    """
+    header = _header.match(sql)
+    if not header:
+        return None
+    rows = _lex_rows(sql, header.end())
+    if not rows:
+        return None
+    values, probes, tail = rows
+    if len(values) < MIN_ROWS:
+        return None
+
+    probe = sql[: header.end()] + ",".join(sql[s:e] for _, (s, e) in probes) + sql[tail:]
+    try:
+        output = parse(probe)
+    except Exception:
+        # LET THE FULL GRAMMAR REPORT THE PROBLEM
+        return None
+    sample = [values[i] for i, _ in probes]
+    if _replace(output, sample, values, columnar):
+        return output
+    return None
+
+
+def _lex_rows(sql, position):
+    """
+    :return: (rows, probes, tail) WHERE probes IS A LIST OF (index, (start, end)) OF THE ROWS TO PROBE,
+             AND tail IS THE OFFSET AFTER THE LAST ROW; None IF NOT ALL LITERALS
+    """
+    rows = []
+    probes = {}
+    width = None
+    match_open, match_value, match_more = _open.match, _value.match, _more.match
+    while True:
+        found = match_open(sql, position)
+        if not found:
+            return None
+        start = found.end() - 1
+        position = found.end()
+        row = []
+        has_double = False
+        while True:
+            found = match_value(sql, position)
+            if not found:
+                return None
+            position = found.end()
+            single, double, real, integer, true, end = found.groups()
+            try:
+                if integer:
+                    value = parse_int([integer])
+                elif real:
+                    value = float(real)
+                elif single:
+                    if single[0] == "'" and "\\" not in single and "\r" not in single:
+                        # NOTHING FOR single_literal() TO UNESCAPE, BUT THE QUOTES
+                        value = single[1:-1].replace("''", "'")
+                    else:
+                        value = get_literal(single_literal([single]))
+                elif double:
+                    # A LITERAL IN SOME DIALECTS, AN IDENTIFIER IN OTHERS, SO PROBE IT
+                    value = get_literal(double_literal([double]))
+                    has_double = True
+                else:
+                    value = True
+            except Exception:
+                return None
+            if not value:
+                # to_values() DOES NOT EMIT THE values FORM FOR FALSY LITERALS
+                return None
+            row.append(value)
+            if end == ")":
+                break
+        if width is None:
+            width = len(row)
+            if width == 1:
+                # to_values() DOES NOT EMIT THE values FORM FOR SINGLE-COLUMN ROWS
+                return None
+            probes[0] = (start, position)
+        elif len(row) != width:
+            return None
+        if has_double and len(probes) < 2:
+            probes[len(rows)] = (start, position)
+        rows.append(row)
+        found = match_more(sql, position)
+        if not found:
+            probes[len(rows) - 1] = (start, position)
+            break
+        position = found.end()
+    return rows, sorted(probes.items()), position
+
+
+def _replace(tree, sample, rows, columnar):
+    """
+    FIND THE LIST OF VALUES THAT MATCHES THE sample ROWS, AND REPLACE IT WITH ALL rows
+    :return: True IF REPLACED
+    """
+    if isinstance(tree, dict):
+        items = tree.items()
+    elif isinstance(tree, list):
+        items = enumerate(tree)
+    else:
+        return False
+    for k, v in list(items):
+        if isinstance(v, list) and len(v) == len(sample):
+            expected = _shape(v, sample)
+            if expected is not None and expected == v:
+                if not columnar:
+                    tree[k] = _shape(v, rows)
+                elif k == "values":
+                    tree.update(to_columns(rows, list(v[0].keys()) if isinstance(v[0], dict) else None))
+                else:
+                    return False
+                return True
+        if _replace(v, sample, rows, columnar):
+            return True
+    return False
+
+
+def _shape(found, rows):
+    """
+    SHAPE THE LEXED rows THE WAY to_insert_call() AND scrub() WOULD, USING found AS THE EXAMPLE
+    """
+    first = found[0]
+    if isinstance(first, dict):
+        columns = list(first.keys())
+        if len(columns) != len(rows[0]):
+            return None
+        return [dict(zip(columns, row)) for row in rows]
+    return rows
+
+
+def columnar_calls(calls, fmap=None):
+    """
+    :param calls: function to emit function calls (eg simple_op)
+    :param fmap: dict to rename functions
+    :return: calls function that also emits the values of an INSERT as columns (see to_columns())
+    """
+    insert = (fmap or {}).get("insert", "insert")
+
+    def op(name, args, kwargs):
+        if name == insert:
+            values = kwargs.get("values")
+            if isinstance(values, list):
+                kwargs = dict(kwargs, **to_columns(values))
+        return calls(name, args, kwargs)
+
+    return op
+
+
+def to_columns(rows, columns=None):
+    """
+    TRANSPOSE THE ROWS OF AN INSERT
+    :param rows: list of rows, each a list of values, or a dict from column name to value
+    :param columns: names of the list values, if known
+    :return: {"columns": columns, "values": {column: array}}, or {"values": [array]} WHEN COLUMNS HAVE NO NAMES
+    """
+    if isinstance(rows[0], dict):
+        columns = list(dict.fromkeys(k for row in rows for k in row))
+        data = [[row.get(c) for row in rows] for c in columns]
+    else:
+        data = zip_longest(*rows)
+    data = [_array(list(d)) for d in data]
+    if columns is None:
+        return {"values": data}
+    return {"columns": columns, "values": dict(zip(columns, data))}
+
+
+def _array(values):
+    """
+    :return: NumPy ARRAY FOR A COLUMN OF NUMBERS, WHEN NumPy IS INSTALLED; OTHERWISE THE values
+    """
+    global numpy
+    if numpy is None:
+        try:
+            import numpy
+        except ImportError:
+            numpy = False
+    if not numpy:
+        return values
+    kinds = set(map(type, values))
+    try:
+        if kinds == {int}:
+            return numpy.array(values, dtype=numpy.int64)
+        if kinds == {float} or kinds == {int, float}:
+            return numpy.array(values, dtype=numpy.float64)
+    except OverflowError:
+        pass
+    return values
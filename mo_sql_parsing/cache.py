@@ -0,0 +1,119 @@
+# encoding: utf-8
+#
+# This Source Code Form is subject to the terms of the Mozilla Public
+# License, v. 2.0. If a copy of the MPL was not distributed with this file,
+# You can obtain one at http://mozilla.org/MPL/2.0/.
+#
+# Contact: Kyle Lahnakoski (kyle@lahnakoski.com)
+#
+from collections import OrderedDict
+from threading import Lock
+
+
+class ParseCache(object):
+    """
+    BOUNDED LRU CACHE OF PARSE TREES
+    EVERY get() RETURNS A COPY, SO CALLERS CAN NOT CORRUPT THE CACHED TREE
+    """
+
+    def __init__(self, size=1000):
+        if size < 1:
+            raise Exception("Expecting cache size to be at least 1")
+        self.size = size
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._data = OrderedDict()
+        self._locker = Lock()
+
+    def parse(self, options, sql, parse):
+        """
+        :param options: hashable tuple of dialect and parse options
+        :param sql: the SQL to parse
+        :param parse: function that parses sql, for when the cache does not have it
+        :return: parse tree
+        """
+        key = (options, sql)
+        found, output = self.get(key)
+        if found:
+            return output
+        output = parse(sql)
+        self.add(key, output)
+        return output
+
+    def get(self, key):
+        """
+        :return: (found, copy_of_tree)
+        """
+        found, tree = self._lookup(key)
+        self._count(found)
+        if not found:
+            return False, None
+        return True, copy_tree(tree)
+
+    def add(self, key, tree):
+        self._store(key, copy_tree(tree))
+
+    def _lookup(self, key):
+        with self._locker:
+            value = self._data.get(key, _missing)
+            if value is _missing:
+                return False, None
+            self._data.move_to_end(key)
+            return True, value
+
+    def _count(self, hit):
+        with self._locker:
+            if hit:
+                self.hits += 1
+            else:
+                self.misses += 1
+
+    def _store(self, key, value):
+        with self._locker:
+            self._data[key] = value
+            self._data.move_to_end(key)
+            while len(self._data) > self.size:
+                self._data.popitem(last=False)
+                self.evictions += 1
+
+    def clear(self):
+        with self._locker:
+            self._data.clear()
+            self.hits = self.misses = self.evictions = 0
+
+    def __len__(self):
+        return len(self._data)
+
+    @property
+    def stats(self):
+        return {"size": len(self._data), "hits": self.hits, "misses": self.misses, "evictions": self.evictions}
+
+
+_missing = object()
+
+
+def copy_tree(tree):
+    """
+    COPY THE dict AND list OF A PARSE TREE; LEAVES ARE IMMUTABLE, OR BELONG TO THE CALLER (eg null)
+    """
+    if isinstance(tree, dict):
+        return {k: copy_tree(v) for k, v in tree.items()}
+    elif isinstance(tree, list):
+        return [copy_tree(v) for v in tree]
+    elif hasattr(tree, "ndim"):
+        # NumPy ARRAY, SEE values_format="columnar"
+        return tree.copy()
+    return tree
+
+
+def freeze(value):
+    """
+    RETURN HASHABLE VERSION OF value, FOR USE IN A CACHE KEY
+    EVERY VALUE IS TAGGED WITH ITS TYPE, BECAUSE 1 == 1.0 == True, BUT THEY ARE DIFFERENT OPTIONS
+    """
+    if isinstance(value, dict):
+        return (dict, tuple(sorted((k, freeze(v)) for k, v in value.items())))
+    elif isinstance(value, (list, tuple)):
+        return (type(value), tuple(freeze(v) for v in value))
+    return (type(value), value)
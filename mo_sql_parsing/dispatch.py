@@ -0,0 +1,226 @@
+# encoding: utf-8
+#
+# This Source Code Form is subject to the terms of the Mozilla Public
+# License, v. 2.0. If a copy of the MPL was not distributed with this file,
+# You can obtain one at http://mozilla.org/MPL/2.0/.
+#
+# Contact: Kyle Lahnakoski (kyle@lahnakoski.com)
+#
+from mo_parsing.enhancement import ParseEnhancement
+from mo_parsing.exceptions import ParseException
+from mo_parsing.expressions import MatchFirst, And
+from mo_parsing.results import ParseResults
+from mo_parsing.tokens import Literal
+
+from mo_sql_parsing.budget import state
+from mo_sql_parsing.lexer import KEYWORD, WORD, iter_tokens
+
+MAX_OBJECT_DISTANCE = 20  # TOKENS TO LOOK PAST CREATE FOR THE OBJECT WORD (eg CREATE OR REPLACE TEMPORARY TABLE)
+CREATE_OBJECTS = {"table", "view", "index", "schema", "trigger", "procedure", "function"}
+WORD_PREFIX, WORD_EQUAL, SYMBOL_PREFIX = 0, 1, 2  # HOW A KEY IS COMPARED TO THE TEXT
+
+
+class KeywordDispatch(ParseEnhancement):
+    """
+    SAME AS MatchFirst(alternatives), BUT SKIPS THE ALTERNATIVES THAT CAN NOT START WITH THE TEXT:
+    * THE FIRST WORD, OR CHARACTER, MUST BE ONE THE ALTERNATIVE EXPECTS
+    * AN ALTERNATIVE THAT STARTS WITH A SYMBOL (eg "(") MUST EXPECT THE TOKEN AFTER IT
+    * FOR CREATE, THE OBJECT WORD THAT FOLLOWS (TABLE, VIEW, ...) MUST BE THE ALTERNATIVE'S
+    """
+
+    __slots__ = ["alternatives", "create_objects", "buckets", "fallback"]
+
+    def __init__(self, alternatives, create_objects=None, fallback=False):
+        """
+        :param alternatives: list of ParserElement, in the order to try them
+        :param create_objects: map from CREATE alternative to its object word
+        :param fallback: True to try all alternatives when none of the shortlist match, so errors are the same
+        """
+        ParseEnhancement.__init__(self, MatchFirst(alternatives))
+        self.alternatives = tuple(alternatives)
+        self.create_objects = {id(a): o for a, o in (create_objects or {}).items()}
+        self.buckets = None  # THE GRAMMAR IS NOT COMPLETE UNTIL THE FIRST PARSE, SO WE LOOK AT IT THEN
+        self.fallback = fallback
+
+    def copy(self):
+        output = ParseEnhancement.copy(self)
+        output.alternatives = self.alternatives
+        output.create_objects = self.create_objects
+        output.buckets = None
+        output.fallback = self.fallback
+        return output
+
+    def streamline(self):
+        if self.streamlined:
+            return self
+        output = ParseEnhancement.streamline(self)
+        streamlined = tuple(a.streamline() for a in self.alternatives)
+        output.create_objects = {id(s): self.create_objects[id(a)] for a, s in zip(self.alternatives, streamlined) if id(a) in self.create_objects}
+        output.alternatives = streamlined
+        output.buckets = None
+        return output
+
+    def _prepare(self):
+        """
+        :return: (default, buckets) - map from first character to the (alternative, keys, follow, object_word) that can start with it
+        """
+        entries = tuple(
+            (a, _first_keys(a), _follow_keys(a), self.create_objects.get(id(a))) for a in self.alternatives
+        )
+        default = tuple(e for e in entries if e[1] is None)
+        firsts = {text[:1] for e in entries if e[1] for _, text in e[1]}
+        buckets = {f: tuple(e for e in entries if e[1] is None or any(t[:1] == f for _, t in e[1])) for f in firsts}
+        self.buckets = default, buckets
+        return self.buckets
+
+    def parse_impl(self, string, start, do_actions=True):
+        word = KEYWORD.match(string, start).group(0).lower()
+        first = string[start : start + 1].lower()
+        default, buckets = self.buckets or self._prepare()
+        obj = after = None
+        failures = []
+        for a, keys, follow, object_word in buckets.get(first, default):
+            if keys is not None and not any(_can_start(k, word, first) for k in keys):
+                continue
+            if follow is not None:
+                if after is None:
+                    after = _next_word(string, start + 1)
+                if not any(_can_start(k, *after) for k in follow):
+                    continue
+            if object_word is not None:
+                if obj is None:
+                    obj = _object_word(string, start) or ""
+                if obj and obj != object_word:
+                    continue
+            try:
+                result = a._parse(string, start, do_actions)
+                failures.extend(result.failures)
+                return ParseResults(self, result.start, result.end, [result], failures)
+            except ParseException as cause:
+                failures.append(cause)
+        if self.fallback:
+            # NOTHING ON THE SHORTLIST MATCHED, LET THE FULL LIST REPORT THE ERROR
+            return ParseEnhancement.parse_impl(self, string, start, do_actions)
+        raise ParseException(self, start, string, cause=failures)
+
+
+class Unreserved(ParseEnhancement):
+    """
+    SAME AS ~MatchFirst(keywords) + expr, BUT THE WORD AT THE START IS LOOKED UP IN A SET, NOT PARSED
+    """
+
+    __slots__ = ["words"]
+
+    def __init__(self, keywords, expr):
+        """
+        :param keywords: list of single-word ParserElement that expr must not start with
+        :param expr: ParserElement to match
+        """
+        ParseEnhancement.__init__(self, expr)
+        self.words = frozenset(k for w in keywords for k in w.expecting())
+
+    def copy(self):
+        output = ParseEnhancement.copy(self)
+        output.words = self.words
+        return output
+
+    def parse_impl(self, string, start, do_actions=True):
+        if KEYWORD.match(string, start).group(0).lower() in self.words:
+            raise ParseException(self, start, string)
+        result = self.expr._parse(string, start, do_actions)
+        return ParseResults(self, result.start, result.end, [result], result.failures)
+
+
+class Guarded(ParseEnhancement):
+    """
+    SAME AS expr, BUT COUNTS AGAINST THE Budget OF THE CURRENT parse(), IF ANY
+    """
+
+    __slots__ = []
+
+    def parse_impl(self, string, start, do_actions=True):
+        budget = state.budget
+        if budget is None:
+            result = self.expr._parse(string, start, do_actions)
+        else:
+            budget.enter(start)
+            try:
+                result = self.expr._parse(string, start, do_actions)
+            finally:
+                budget.depth -= 1
+        return ParseResults(self, result.start, result.end, [result], result.failures)
+
+
+def _first_keys(element):
+    """
+    :return: tuple of (how, text) for the lowercase text the element can start with, or None if it can start with anything
+    """
+    keys = element.expecting()
+    if not keys:
+        return None
+    output = []
+    for key in sorted({k.lower() for k in keys}):
+        head = KEYWORD.match(key).group(0)
+        if len(head) == len(key):
+            # ALL WORD CHARACTERS, SO THE WORD IN THE TEXT MUST START WITH IT
+            output.append((WORD_PREFIX, key))
+        elif head:
+            # A WORD, THEN SOMETHING ELSE (eg "create index"), SO THE WORD IN THE TEXT MUST BE IT
+            output.append((WORD_EQUAL, head))
+        else:
+            output.append((SYMBOL_PREFIX, key))
+    return tuple(output)
+
+
+def _follow_keys(element):
+    """
+    :return: FOR AN ELEMENT THAT STARTS WITH A SYMBOL, LIKE "(", THE KEYS OF WHAT COMES NEXT, OR None
+    """
+    while not isinstance(element, And) and isinstance(getattr(element, "expr", None), And):
+        element = element.expr
+    if not isinstance(element, And) or len(element.exprs) < 2:
+        return None
+    head = element.exprs[0]
+    while not isinstance(head, Literal) and isinstance(getattr(head, "expr", None), Literal):
+        head = head.expr
+    if not isinstance(head, Literal) or len(head.parser_config.match) != 1 or KEYWORD.match(head.parser_config.match).end():
+        return None
+    return _first_keys(element.exprs[1])
+
+
+def _can_start(key, word, first):
+    """
+    :param key: (how, text) from _first_keys()
+    :param word: the lowercase word at the start of the text, maybe empty
+    :param first: the first character of the text, in lowercase
+    :return: False IF THE TEXT CAN NOT START WITH key
+    """
+    how, text = key
+    if how == WORD_PREFIX:
+        return word.startswith(text)
+    if how == WORD_EQUAL:
+        return word == text
+    return text.startswith(first)
+
+
+def _next_word(string, start):
+    """
+    :return: (word, first) OF THE NEXT TOKEN, PAST WHITESPACE AND COMMENTS
+    """
+    for _, begin, _ in iter_tokens(string, start):
+        return KEYWORD.match(string, begin).group(0).lower(), string[begin : begin + 1].lower()
+    return "", ""
+
+
+def _object_word(string, start):
+    """
+    :return: the first of table, view, ... after CREATE, or None
+    """
+    for i, (kind, begin, end) in enumerate(iter_tokens(string, start)):
+        if i > MAX_OBJECT_DISTANCE:
+            break
+        if kind == WORD:
+            word = string[begin:end].lower()
+            if word in CREATE_OBJECTS:
+                return word
+    return None
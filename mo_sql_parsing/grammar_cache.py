@@ -0,0 +1,202 @@
+# encoding: utf-8
+#
+# This Source Code Form is subject to the terms of the Mozilla Public
+# License, v. 2.0. If a copy of the MPL was not distributed with this file,
+# You can obtain one at http://mozilla.org/MPL/2.0/.
+#
+# Contact: Kyle Lahnakoski (kyle@lahnakoski.com)
+#
+"""
+KEEP FINALIZED PARSERS ON DISK, SO NEW PROCESSES DO NOT REBUILD THE GRAMMAR
+
+THE GRAMMAR HOLDS LAMBDAS AND CLOSURES, WHICH THE STANDARD pickle CAN NOT
+HANDLE, SO GrammarPickler WRITES THEM AS MARSHALLED CODE.  CACHE FILES ARE
+ONLY VALID FOR THE SAME PYTHON, mo-parsing AND mo-sql-parsing VERSIONS.
+ONLY LOAD CACHE FILES YOU WROTE YOURSELF: UNPICKLING RUNS CODE.
+"""
+import hashlib
+import importlib
+import io
+import marshal
+import os
+import pickle
+import sys
+import types
+
+from mo_parsing.core import ParserElement
+from mo_parsing.whitespaces import Whitespace
+
+RECURSION_LIMIT = 20_000  # THE GRAMMAR IS A DEEP GRAPH
+GLOBAL_PACKAGES = ["mo_sql_parsing", "mo_parsing", "mo_dots", "mo_future", "mo_imports"]
+SOURCE_MODULES = [
+    "__init__", "sql_parser", "infix", "dispatch", "bulk", "budget", "utils", "keywords", "types", "windows", "lexer"
+]
+
+
+def cache_key():
+    """
+    :return: string that changes when Python, mo-parsing, or the mo-sql-parsing source changes
+    """
+    digest = hashlib.sha1()
+    digest.update(sys.implementation.cache_tag.encode("utf8"))
+    digest.update(_version("mo-parsing").encode("utf8"))
+    digest.update(_version("mo-sql-parsing").encode("utf8"))
+    directory = os.path.dirname(os.path.abspath(__file__))
+    for name in SOURCE_MODULES:
+        with open(os.path.join(directory, name + ".py"), "rb") as file:
+            digest.update(file.read())
+    return digest.hexdigest()[:16]
+
+
+def _version(package):
+    try:
+        from importlib.metadata import version
+
+        return version(package)
+    except Exception:
+        return "unknown"
+
+
+def cache_file(directory, parser_name, all_columns):
+    columns = "star" if all_columns == "*" else "none"
+    return os.path.join(directory, f"{parser_name}-{columns}-{cache_key()}.pickle")
+
+
+def load(filename):
+    """
+    :return: the parser, or None if there is no usable cache file
+    """
+    try:
+        with open(filename, "rb") as file:
+            content = file.read()
+    except OSError:
+        return None
+    with _deep_recursion():
+        try:
+            return pickle.loads(content)
+        except Exception:
+            return None
+
+
+def save(filename, parser):
+    buffer = io.BytesIO()
+    with _deep_recursion():
+        GrammarPickler(buffer, protocol=pickle.HIGHEST_PROTOCOL).dump(parser)
+    os.makedirs(os.path.dirname(filename), exist_ok=True)
+    temp = f"{filename}.{os.getpid()}.tmp"
+    with open(temp, "wb") as file:
+        file.write(buffer.getvalue())
+    os.replace(temp, filename)  # SO OTHER PROCESSES NEVER SEE HALF A FILE
+
+
+class _deep_recursion(object):
+    def __enter__(self):
+        self.limit = sys.getrecursionlimit()
+        sys.setrecursionlimit(max(self.limit, RECURSION_LIMIT))
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        sys.setrecursionlimit(self.limit)
+
+
+class GrammarPickler(pickle.Pickler):
+    def __init__(self, file, protocol=None):
+        pickle.Pickler.__init__(self, file, protocol=protocol)
+        self.config_owners = _config_owners()
+        self.module_globals = _module_globals()
+
+    def reducer_override(self, obj):
+        found = self.module_globals.get(id(obj))
+        if found:
+            # SENTINELS (eg SQL_NULL, RIGHT_ASSOC) ARE COMPARED BY IDENTITY, AND
+            # MODULE-LEVEL GRAMMAR IS SHARED BY ALL PARSERS, SO KEEP BOTH BY REFERENCE
+            return _module_global, found
+        if type(obj) is Whitespace and (obj.parent or obj.copies):
+            # parent AND copies ONLY MATTER WHILE BUILDING THE GRAMMAR
+            func, args, state = obj.__reduce_ex__(pickle.HIGHEST_PROTOCOL)[:3]
+            return func, args, dict(state, parent=None, copies=[])
+        if type(obj) in self.config_owners:
+            # mo-parsing MAKES A Config namedtuple PER CLASS, WHICH CAN NOT BE FOUND BY NAME
+            return _make_config, (self.config_owners[type(obj)], tuple(obj))
+        if type(obj) is types.FunctionType and not _is_importable(obj):
+            cells = []
+            for cell in obj.__closure__ or ():
+                try:
+                    cells.append(cell.cell_contents)
+                except ValueError:
+                    cells.append(_EMPTY_CELL)
+            return (
+                _make_function,
+                (marshal.dumps(obj.__code__), obj.__module__, obj.__name__, len(cells)),
+                (obj.__defaults__, obj.__kwdefaults__, cells, obj.__dict__),
+                None,
+                None,
+                _fill_function,
+            )
+        return NotImplemented
+
+
+_EMPTY_CELL = "__empty_cell__"
+# NOT BY REFERENCE: pickle ALREADY HANDLES IT, IDENTITY DOES NOT MATTER, OR THE GLOBAL IS REASSIGNED WHILE BUILDING (eg whitespaces.CURRENT)
+_by_value = (str, bytes, int, float, bool, type(None), type, types.FunctionType, types.ModuleType, Whitespace)
+
+
+def _is_importable(func):
+    try:
+        found = importlib.import_module(func.__module__)
+        for name in func.__qualname__.split("."):
+            found = getattr(found, name)
+        return found is func
+    except Exception:
+        return False
+
+
+def _make_function(code, module, name, num_cells):
+    # CELLS ARE FILLED LATER, BY _fill_function, SO CLOSURES MAY REFER BACK TO THE GRAMMAR
+    closure = tuple(types.CellType() for _ in range(num_cells)) or None
+    return types.FunctionType(marshal.loads(code), importlib.import_module(module).__dict__, name, None, closure)
+
+
+def _fill_function(func, state):
+    defaults, kwdefaults, cells, attributes = state
+    func.__defaults__ = defaults
+    func.__kwdefaults__ = kwdefaults
+    for cell, value in zip(func.__closure__ or (), cells):
+        if value != _EMPTY_CELL:
+            cell.cell_contents = value
+    func.__dict__.update(attributes)
+    return func
+
+
+def _module_global(module, name):
+    return getattr(importlib.import_module(module), name)
+
+
+def _module_globals():
+    """
+    :return: map from id() TO (module, name) FOR THE GLOBALS OF THE MODULES THE GRAMMAR USES
+    """
+    output = {}
+    for module_name, module in list(sys.modules.items()):
+        if module_name == "mo_sql_parsing" or module_name.split(".")[0] not in GLOBAL_PACKAGES:
+            continue
+        for name, value in list(vars(module).items()):
+            if isinstance(value, _by_value) or id(value) in output:
+                continue
+            output[id(value)] = (module_name, name)
+    return output
+
+
+def _make_config(owner, values):
+    return owner.Config(*values)
+
+
+def _config_owners():
+    owners = {}
+    todo = [ParserElement]
+    while todo:
+        cls = todo.pop()
+        config = cls.__dict__.get("Config")
+        if config is not None:
+            owners.setdefault(config, cls)
+        todo.extend(cls.__subclasses__())
+    return owners
@@ -0,0 +1,183 @@
+# encoding: utf-8
+#
+# This Source Code Form is subject to the terms of the Mozilla Public
+# License, v. 2.0. If a copy of the MPL was not distributed with this file,
+# You can obtain one at http://mozilla.org/MPL/2.0/.
+#
+# Contact: Kyle Lahnakoski (kyle@lahnakoski.com)
+#
+from mo_parsing import whitespaces
+from mo_parsing.enhancement import Forward, Group, Suppress, ZeroOrMore
+from mo_parsing.exceptions import ParseException
+from mo_parsing.expressions import MatchFirst, Or
+from mo_parsing.infix import LEFT_ASSOC, RIGHT_ASSOC
+from mo_parsing.results import ParseResults, NO_PARSER
+from mo_parsing.tokens import Empty, Literal
+from mo_parsing.utils import wrap_parse_action, enlist
+
+_no_op = Empty().suppress()
+
+
+def infix_notation(base_expr, spec, lpar=Suppress(Literal("(")), rpar=Suppress(Literal(")"))):
+    """
+    SAME AS mo_parsing.infix_notation(), BUT THE FLAT LIST OF OPERANDS AND OPERATORS
+    IS MADE INTO A TREE WITH ONE PRECEDENCE-CLIMBING PASS, NOT ONE SCAN PER PRECEDENCE LEVEL
+
+    :param base_expr: expression for the operands
+    :param spec: list of (op_expr, num_terms, LEFT_ASSOC or RIGHT_ASSOC, parse_action), tightest first;
+                 op_expr is a pair of expressions when num_terms==3; unary RIGHT_ASSOC is a prefix operator
+    :param lpar: expression for matching left-parentheses
+    :param rpar: expression for matching right-parentheses
+    :return: ParserElement
+    """
+    all_op = {}
+
+    def norm(op):
+        if op == None:
+            op = _no_op
+        output = all_op.get(id(op))
+        if output:
+            return output
+
+        def record_self(tok):
+            ParseResults(tok.type, tok.start, tok.end, [tok.type.parser_name], [])
+
+        output = whitespaces.CURRENT.normalize(op)
+        is_suppressed = isinstance(output, Suppress)
+        if is_suppressed:
+            output = output.expr
+        output = output / record_self
+        all_op[id(op)] = is_suppressed, output
+        return is_suppressed, output
+
+    # (expr, op, is_suppressed, arity, assoc, parse_actions), ONE PER LEVEL; expr IS ONLY USED TO TYPE THE RESULT
+    op_list = []
+    prefixes = {}  # MAP FROM OPERATOR TO LEVEL
+    suffixes = {}
+    binaries = {}
+    ternaries = {}  # MAP FROM FIRST OPERATOR TO (LEVEL, SECOND OPERATOR)
+    for level, oper_def in enumerate(spec):
+        op, arity, assoc, rest = oper_def[0], oper_def[1], oper_def[2], oper_def[3:]
+        parse_actions = list(map(wrap_parse_action, enlist(rest[0]))) if rest else []
+        if arity == 1:
+            is_suppressed, op = norm(op)
+            if assoc == RIGHT_ASSOC:
+                expr = Group(base_expr + op)
+                prefixes.setdefault(op, level)
+            else:
+                expr = Group(op + base_expr)
+                suffixes.setdefault(op, level)
+        elif arity == 2:
+            is_suppressed, op = norm(op)
+            expr = Group(base_expr + op + base_expr)
+            binaries.setdefault(op, level)
+        else:
+            is_suppressed, op = zip(norm(op[0]), norm(op[1]))
+            expr = Group(base_expr + op[0] + base_expr + op[1] + base_expr)
+            ternaries.setdefault(op[0], (level, op[1]))
+        op_list.append((expr, op, is_suppressed, arity, assoc, parse_actions))
+    op_list = tuple(op_list)
+
+    def record_op(op):
+        def output(tokens):
+            return ParseResults(NO_PARSER, tokens.start, tokens.end, [(tokens, op)], [])
+
+        return output
+
+    prefix_ops = MatchFirst([op / record_op(op) for op in prefixes])
+    suffix_ops = MatchFirst([op / record_op(op) for op in suffixes])
+    op_parts = list(binaries)
+    for first, (_, second) in ternaries.items():
+        op_parts.extend([first, second])
+    ops = Or([op / record_op(op) for op in dict.fromkeys(op_parts)])
+
+    def reduce(level, operands, string):
+        expr, op, is_suppressed, arity, assoc, parse_actions = op_list[level]
+        if arity == 1:
+            if assoc == RIGHT_ASSOC:
+                r, tok = operands
+                tokens = (tok,) if is_suppressed else operands
+            else:
+                tok, r = operands
+                tokens = (tok,) if is_suppressed else operands
+        elif arity == 2:
+            tokens = (operands[0], operands[2]) if is_suppressed else operands
+        else:
+            s0, s1 = is_suppressed
+            tokens = [operands[0], operands[2], operands[4]]
+            if not s1:
+                tokens.insert(2, operands[3])
+            if not s0:
+                tokens.insert(1, operands[1])
+        result = ParseResults(expr, tokens[0].start, tokens[-1].end, tokens, [])
+        for p in parse_actions:
+            result = p(result, -1, string)
+        return result
+
+    def climb(items, index, limit, string):
+        """
+        :param items: list of (tokens, op) pairs, in order
+        :param index: where the operand starts
+        :param limit: only take operators of lower (tighter) level
+        :return: (result, index after the operand)
+        """
+        r, o = items[index]
+        level = prefixes.get(o)
+        if level is not None:
+            operand, index = climb(items, index + 1, level, string)
+            left = reduce(level, (r, operand), string)
+        else:
+            left = r
+            index += 1
+
+        size = len(items)
+        while index < size:
+            r, o = items[index]
+            level = suffixes.get(o)
+            if level is not None:
+                if level >= limit:
+                    break
+                left = reduce(level, (left, r), string)
+                index += 1
+                continue
+
+            level = binaries.get(o)
+            if level is not None:
+                if level >= limit:
+                    break
+                inner = level if op_list[level][4] == LEFT_ASSOC else level + 1
+                right, index = climb(items, index + 1, inner, string)
+                left = reduce(level, (left, r, right), string)
+                continue
+
+            level, second = ternaries.get(o, (None, None))
+            if level is None or level >= limit:
+                break
+            middle, index = climb(items, index + 1, level, string)
+            if index >= size or items[index][1] is not second:
+                raise ParseException(flat, r.start, string, msg=f"Expecting {second}")
+            r1 = items[index][0]
+            right, index = climb(items, index + 1, level, string)
+            left = reduce(level, (left, r, middle, r1, right), string)
+        return left, index
+
+    def make_tree(tokens, loc, string):
+        items = list(tokens)
+        if len(items) == 1:
+            result = items[0][0]
+        else:
+            result, index = climb(items, 0, len(op_list), string)
+            if index < len(items):
+                raise ParseException(flat, items[index][0].start, string, msg="Expecting an operator")
+        result.end = tokens.end
+        # THE PARSE ACTION WRAPPER ADDS tokens.failures TO THESE; SHARING ONE LIST WOULD DOUBLE IT AT EVERY NESTING
+        result.failures = []
+        return result
+
+    flat = Forward()
+    iso = lpar.suppress() + flat + rpar.suppress()
+    atom = (base_expr | iso) / record_op(base_expr)
+    decorated = ZeroOrMore(prefix_ops) + atom + ZeroOrMore(suffix_ops)
+    flat << ((decorated + ZeroOrMore(ops + decorated)) / make_tree).streamline()
+
+    return flat.streamline()
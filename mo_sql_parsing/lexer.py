@@ -0,0 +1,134 @@
+# encoding: utf-8
+#
+# This Source Code Form is subject to the terms of the Mozilla Public
+# License, v. 2.0. If a copy of the MPL was not distributed with this file,
+# You can obtain one at http://mozilla.org/MPL/2.0/.
+#
+# Contact: Kyle Lahnakoski (kyle@lahnakoski.com)
+#
+import re
+
+WORD = "word"  # KEYWORD OR PLAIN IDENTIFIER
+IDENTIFIER = "identifier"  # QUOTED IDENTIFIER
+STRING = "string"
+NUMBER = "number"
+SYMBOL = "symbol"  # OPERATOR OR PUNCTUATION
+
+# THE PIECES OF SQL EVERY TOKENIZER IN THIS PACKAGE (HERE, statements.py, templates.py, bulk.py, dispatch.py)
+# IS BUILT FROM, SO THEY AGREE ON QUOTING AND COMMENTS
+IDENT = "[@_$0-9A-Za-zÀ-ÖØ-öø-ƿ]"  # SAME AS utils.IDENT_CHAR, WITHOUT IMPORTING THE GRAMMAR
+KEYWORD = re.compile(r"[$0-9A-Za-z_]*")  # SAME AS THE WORD BOUNDARY OF THE KEYWORDS
+CHARSET = r"(?:_utf8mb4|_utf8|_latin1|_ascii|_ucs2|_binary|n|N)?"  # PREFIX OF A 'string'
+HEX = r"0x[0-9a-fA-F]+"
+REAL = r"(?:\d+\.\d*|\.\d+)(?:[eE][+-]?\d+)?"
+INT = r"\d+(?:[eE]\+?\d+)?"
+# MAP FROM OPENER TO (BODY, CLOSER) PATTERNS; A BODY NEVER MATCHES ITS CLOSER
+QUOTES = {
+    "'": (r"(?:''|[^'])*", "'"),
+    '"': (r'(?:""|[^"])*', '"'),
+    "`": (r"(?:``|[^`])*", "`"),
+    "[": (r"(?:\]\]|[^\]])*", r"\]"),
+}
+COMMENTS = {
+    "--": (r"[^\n]*", r"\n"),
+    "#": (r"[^\n]*", r"\n"),
+    "/*": (r"(?:(?!\*/)[\s\S])*", r"\*/"),
+}
+
+
+MAX_NESTING = 8  # DEPTH OF NESTED BLOCK COMMENTS, FOR THE DIALECTS THAT NEST THEM; re CAN NOT COUNT
+
+
+def _nested(depth):
+    # BODY OF A BLOCK COMMENT THAT MAY HOLD OTHER BLOCK COMMENTS, UP TO depth DEEP
+    body = r"(?:(?!/\*|\*/)[\s\S])*"
+    for _ in range(depth):
+        body = rf"(?:(?!/\*|\*/)[\s\S]|/\*{body}\*/)*"
+    return body
+
+
+# T-SQL HAS NO # COMMENTS (#name IS A TEMPORARY TABLE), AND ITS BLOCK COMMENTS NEST
+SQLSERVER_COMMENTS = {"--": COMMENTS["--"], "/*": (_nested(MAX_NESTING), r"\*/")}
+
+
+def quoted(opener, comments=COMMENTS):
+    """
+    :param opener: key of QUOTES or comments
+    :param comments: the comment rules to use, COMMENTS or SQLSERVER_COMMENTS
+    :return: pattern of the whole quote, or comment; one that is not closed runs to the end
+    """
+    body, closer = QUOTES.get(opener) or comments[opener]
+    return f"{re.escape(opener)}{body}(?:{closer}|\\Z)"
+
+
+def comment_pattern(comments=COMMENTS):
+    """
+    :param comments: the comment rules to use, COMMENTS or SQLSERVER_COMMENTS
+    :return: pattern of one comment; a line comment leaves its newline, a block comment must be closed
+    """
+    return "|".join(
+        re.escape(opener) + body + ("" if closer == r"\n" else closer) for opener, (body, closer) in comments.items()
+    )
+
+
+# HOW EACH DIALECT QUOTES, SAME AS THE literal_string AND atomic_ident OF THE PARSERS IN sql_parser.py
+_quotes = {
+    "common_parser": {'"': IDENTIFIER, "`": IDENTIFIER},
+    "mysql_parser": {'"': STRING, "`": IDENTIFIER, "[": IDENTIFIER},
+    "sqlserver_parser": {'"': IDENTIFIER, "`": IDENTIFIER, "[": IDENTIFIER},
+    "bigquery_parser": {'"': STRING, "`": IDENTIFIER},
+}
+# HOW EACH DIALECT COMMENTS, SAME AS THE GRAMMAR SKIPS
+_comments = {
+    "common_parser": COMMENTS,
+    "mysql_parser": COMMENTS,
+    "sqlserver_parser": SQLSERVER_COMMENTS,
+    "bigquery_parser": COMMENTS,
+}
+_symbols = ["<=>", "->>", "::", ":=", "<>", "!=", ">=", "<=", "==", "||", "->", "=>", "<<", ">>"]
+_patterns = {}  # MAP FROM PARSER NAME TO COMPILED PATTERN
+
+
+def _pattern(parser_name):
+    pattern = _patterns.get(parser_name)
+    if pattern:
+        return pattern
+    quotes = _quotes[parser_name]
+    comments = _comments[parser_name]
+    pattern = _patterns[parser_name] = re.compile(
+        "|".join([
+            # AN UNTERMINATED /* RUNS TO THE END
+            "(?P<skip>(?:\\s+|" + "|".join(quoted(c, comments) for c in comments) + ")+)",
+            r"""(?P<string>r'(?:\\'|[^'])*(?:'|\Z)|r"(?:\\"|[^"])*(?:"|\Z)|""" + CHARSET + quoted("'") + ")",
+            *(f"(?P<{kind}{i}>{quoted(q)})" for i, (q, kind) in enumerate(quotes.items())),
+            f"(?P<number>{HEX}|{REAL}|{INT})",
+            f"(?P<word>{IDENT}+)",
+            "(?P<symbol>" + "|".join(re.escape(s) for s in _symbols) + "|.)",
+        ]),
+        re.DOTALL,
+    )
+    return pattern
+
+
+def tokenize(sql, parser_name="common_parser"):
+    """
+    SPLIT sql INTO TOKENS, ONCE, WITHOUT RUNNING THE GRAMMAR
+    WHITESPACE AND COMMENTS (--, #, /* */; SQL SERVER HAS NO #, AND NESTS /* */) ARE DROPPED
+    AN UNTERMINATED QUOTE OR COMMENT RUNS TO THE END
+    :param sql: String of SQL
+    :param parser_name: the parser whose quoting rules to follow
+    :return: list of (kind, start, end); kind is one of WORD, IDENTIFIER, STRING, NUMBER, SYMBOL
+    """
+    return list(iter_tokens(sql, 0, parser_name))
+
+
+def iter_tokens(sql, start=0, parser_name="common_parser"):
+    """
+    SAME AS tokenize(), BUT LAZY, SO THE CALLER CAN STOP EARLY
+    :param start: offset to start at
+    """
+    for found in _pattern(parser_name).finditer(sql, start):
+        kind = found.lastgroup
+        if kind == "skip":
+            continue
+        yield kind.rstrip("0123456789"), found.start(), found.end()
@@ -0,0 +1,128 @@
+# encoding: utf-8
+#
+# This Source Code Form is subject to the terms of the Mozilla Public
+# License, v. 2.0. If a copy of the MPL was not distributed with this file,
+# You can obtain one at http://mozilla.org/MPL/2.0/.
+#
+# Contact: Kyle Lahnakoski (kyle@lahnakoski.com)
+#
+import json
+from time import perf_counter
+
+from mo_parsing.core import ParserElement
+from mo_parsing.exceptions import ParseException
+
+ATTEMPTS, MATCHES, FAILURES, SECONDS = 0, 1, 2, 3  # INDEX INTO THE COUNTERS OF A RULE
+
+
+class Profile(object):
+    """
+    COUNTS MATCH ATTEMPTS, MATCHES, FAILURES, AND CUMULATIVE TIME, FOR EACH NAMED GRAMMAR RULE
+    (THE NAMES GIVEN BY set_parser_name() AND set_parser_names()); UNNAMED ELEMENTS ARE NOT COUNTED
+    WHILE ACTIVE, EVERY PARSE, ON ANY THREAD, IS COUNTED
+    """
+
+    __slots__ = ["rules", "active", "cache_hits", "seconds", "_original", "_start", "_hits"]
+
+    def __init__(self):
+        self.rules = {}  # MAP FROM RULE NAME TO [attempts, matches, failures, seconds]
+        self.active = {}  # MAP FROM RULE NAME TO HOW MANY TIMES IT IS ON THE STACK, SO RECURSION IS TIMED ONCE
+        self.cache_hits = 0
+        self.seconds = 0
+        self._original = None
+        self._start = None
+        self._hits = None
+
+    def __enter__(self):
+        if ParserElement._parse is not _original_parse:
+            raise Exception("Expecting only one profile() at a time")
+        rules, active = self.rules, self.active
+        original = self._original = _original_parse
+
+        def _parse(element, string, start, do_actions=True):
+            name = element.parser_name
+            if not name:
+                return original(element, string, start, do_actions)
+            counters = rules.get(name)
+            if counters is None:
+                counters = rules[name] = [0, 0, 0, 0.0]
+            counters[ATTEMPTS] += 1
+            depth = active.get(name, 0)
+            active[name] = depth + 1
+            begin = perf_counter()
+            try:
+                result = original(element, string, start, do_actions)
+                counters[MATCHES] += 1
+                return result
+            except ParseException:
+                counters[FAILURES] += 1
+                raise
+            finally:
+                active[name] = depth
+                if not depth:
+                    counters[SECONDS] += perf_counter() - begin
+
+        self._hits = _cache_hits()
+        self._start = perf_counter()
+        ParserElement._parse = _parse
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        ParserElement._parse = self._original
+        self.seconds += perf_counter() - self._start
+        self.cache_hits += _cache_hits() - self._hits
+
+    @property
+    def stats(self):
+        """
+        :return: list of dicts, one per rule, most time first
+        """
+        return sorted(
+            (
+                {
+                    "rule": name,
+                    "attempts": attempts,
+                    "matches": matches,
+                    "failures": failures,
+                    "seconds": seconds,
+                }
+                for name, (attempts, matches, failures, seconds) in self.rules.items()
+            ),
+            key=lambda s: (-s["seconds"], -s["attempts"], s["rule"]),
+        )
+
+    def report(self, limit=None):
+        """
+        :param limit: maximum number of rules to show (default all)
+        :return: text table of the rules, most time first
+        """
+        stats = self.stats[:limit]
+        width = max([len(s["rule"]) for s in stats] + [4])
+        lines = [
+            f"{'rule':{width}}  {'attempts':>10}  {'matches':>10}  {'failures':>10}  {'ms':>10}  {'us/attempt':>10}"
+        ]
+        for s in stats:
+            lines.append(
+                f"{s['rule']:{width}}  {s['attempts']:>10,}  {s['matches']:>10,}  {s['failures']:>10,}"
+                f"  {s['seconds'] * 1000:>10.1f}  {s['seconds'] * 1_000_000 / s['attempts']:>10.2f}"
+            )
+        lines.append(f"total {self.seconds * 1000:.1f} ms, parse cache hits {self.cache_hits:,}")
+        return "\n".join(lines)
+
+    def to_json(self):
+        """
+        :return: JSON string with the totals and the stats of every rule
+        """
+        return json.dumps({"seconds": self.seconds, "cache_hits": self.cache_hits, "rules": self.stats})
+
+
+def _cache_hits():
+    """
+    :return: hits of the parse cache so far, if there is one
+    """
+    from mo_sql_parsing import parse_cache
+
+    return parse_cache.hits if parse_cache is not None else 0
+
+
+_original_parse = ParserElement._parse
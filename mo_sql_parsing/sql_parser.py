@@ -10,9 +10,13 @@ from mo_parsing import debug, Null
 from mo_parsing.whitespaces import NO_WHITESPACE, Whitespace
 
 from mo_sql_parsing import utils
+from mo_sql_parsing.bulk import LiteralTuple
+from mo_sql_parsing.dispatch import KeywordDispatch, Unreserved, Guarded
 from mo_sql_parsing.keywords import *
+from mo_sql_parsing.lexer import COMMENTS, SQLSERVER_COMMENTS, comment_pattern
 from mo_sql_parsing.types import get_column_type, time_functions, _sizes
 from mo_sql_parsing.utils import *
+from mo_sql_parsing.infix import infix_notation
 from mo_sql_parsing.windows import window
 
 delimiter_pattern = Literal(";").suppress()
@@ -24,8 +28,6 @@ def common_parser(all_columns):
 
 
 def mysql_parser(all_columns):
-    utils.emit_warning_for_double_quotes = False
-
     mysql_string = regex_string | ansi_string | mysql_doublequote_string
     atomic_ident = mysql_backtick_ident | sqlserver_ident | ident_w_dash_warning
     return parser(mysql_string, atomic_ident, all_columns=all_columns)
@@ -49,15 +51,10 @@ def parser(literal_string, simple_ident, all_columns=None, sqlserver=False):
     ident = Combine(delimited_list(simple_ident, separator=".", combine=True))
 
     with Whitespace() as white:
-        rest_of_line = Regex(r"[^\n]*")
-
-        white.add_ignore(Literal("--") + rest_of_line)
-        white.add_ignore(Literal("#") + rest_of_line)
-        white.add_ignore(Literal("/*") + SkipTo("*/", include=True))
+        white.add_ignore(Regex(comment_pattern(SQLSERVER_COMMENTS if sqlserver else COMMENTS)))
 
-        with whitespaces.NO_WHITESPACE:
-            identifier = ~RESERVED + ident
-        function_name = ~(UNION | FROM | WHERE | SELECT) + ident
+        identifier = Unreserved(RESERVED.exprs, ident)
+        function_name = Unreserved([UNION, FROM, WHERE, SELECT], ident)
 
         # EXPRESSIONS
         expression = Forward()
@@ -211,7 +208,7 @@ def parser(literal_string, simple_ident, all_columns=None, sqlserver=False):
         ])
 
         formatted_duration = Regex("[@Pp]*") + (delimited_list(
-            (sql_time ^ sql_date ^ iso_datetime) / to_interval_call, separator=Regex("[,TtPp]*"),
+            Guarded((sql_time ^ sql_date ^ iso_datetime) / to_interval_call), separator=Regex("[,TtPp]*"),
         ))
 
         interval = (
@@ -336,40 +333,40 @@ def parser(literal_string, simple_ident, all_columns=None, sqlserver=False):
             scale_function = ((real_num | int_num) + call_function) / scale
             scale_ident = ((real_num | int_num) + ident) / scale
 
-        compound = (
-            NULL
-            | TRUE
-            | FALSE
-            | NOCASE
-            | interval
-            | timestamp
-            | extract
-            | case
-            | switch
-            | casting
-            | oracle_casting
-            | substring
-            | distinct
-            | trim
-            | stack
-            | create_array
-            | create_map
-            | create_struct
-            | (LB + Group(query) + RB)
-            | (LB + Group(delimited_list(expression)) / to_tuple_call + RB)
-            | literal_string
-            | hex_num
-            | scale_function
-            | scale_ident
-            | real_num
-            | int_num
-            | call_function
-            | Combine(function_name + Optional(".*"))
-        )
+        compound = KeywordDispatch([
+            NULL,
+            TRUE,
+            FALSE,
+            NOCASE,
+            interval,
+            timestamp,
+            extract,
+            case,
+            switch,
+            casting,
+            oracle_casting,
+            substring,
+            distinct,
+            trim,
+            stack,
+            create_array,
+            create_map,
+            create_struct,
+            (LB + Group(query) + RB),
+            LiteralTuple(LB + Group(delimited_list(expression)) / to_tuple_call + RB),
+            literal_string,
+            hex_num,
+            scale_function,
+            scale_ident,
+            real_num,
+            int_num,
+            call_function,
+            Combine(function_name + Optional(".*")),
+        ])
 
         window_clause, over_clause = window(expression, identifier, sort_column)
 
-        expression << (
+        expression << Guarded(
             (
                 Literal("*")
                 | infix_notation(
@@ -391,8 +388,8 @@ def parser(literal_string, simple_ident, all_columns=None, sqlserver=False):
                         for o in KNOWN_OPS
                     ],
                 )
-            )("value").set_parser_name("expression")
-        )
+            )
+        )("value").set_parser_name("expression")
 
         table_source = Forward()
 
@@ -611,14 +608,17 @@ def parser(literal_string, simple_ident, all_columns=None, sqlserver=False):
             )))
         )("using")
 
-        query << (
-            ZeroOrMore(MatchFirst([
-                assign("with recursive", with_clause),
-                assign("with", with_clause),
-                using_external_function,
-            ]))
-            + Group(ordered_sql)("query")
-        ) / to_query
+        query << Guarded(
+            (
+                ZeroOrMore(MatchFirst([
+                    assign("with recursive", with_clause),
+                    assign("with", with_clause),
+                    using_external_function,
+                ]))
+                + Group(ordered_sql)("query")
+            )
+            / to_query
+        )
 
         #####################################################################
         # DML STATEMENTS
@@ -1129,22 +1129,44 @@ def parser(literal_string, simple_ident, all_columns=None, sqlserver=False):
 
         debugger.__enter__()
 
-        statement << Group(
-            query
-            | (insert | update | delete | merge | truncate | use_schema)
-            | (create_table | create_view | create_cache | create_index | create_schema)
-            | drops
-            | (copy | alter)
-            | create_trigger
-            | create_procedure
-            | create_function
-            | explain
-            | delimiter_command
-            | declare_hanlder
-            | flow
-            | transact
-            | (Optional(keyword("alter session")).suppress() + (set_variables | unset_one_variable | declare_variable))
-        )
+        statement << Group(KeywordDispatch(
+            [
+                query,
+                insert,
+                update,
+                delete,
+                merge,
+                truncate,
+                use_schema,
+                create_table,
+                create_view,
+                create_cache,
+                create_index,
+                create_schema,
+                drops,
+                copy,
+                alter,
+                create_trigger,
+                create_procedure,
+                create_function,
+                explain,
+                delimiter_command,
+                declare_hanlder,
+                flow,
+                transact,
+                Optional(keyword("alter session")).suppress() + (set_variables | unset_one_variable | declare_variable),
+            ],
+            create_objects={
+                create_table: "table",
+                create_view: "view",
+                create_index: "index",
+                create_schema: "schema",
+                create_trigger: "trigger",
+                create_procedure: "procedure",
+                create_function: "function",
+            },
+            fallback=True,
+        ))
 
         many_command << (
             ZeroOrMore(delimiter_pattern)
@@ -0,0 +1,276 @@
+# encoding: utf-8
+#
+# This Source Code Form is subject to the terms of the Mozilla Public
+# License, v. 2.0. If a copy of the MPL was not distributed with this file,
+# You can obtain one at http://mozilla.org/MPL/2.0/.
+#
+# Contact: Kyle Lahnakoski (kyle@lahnakoski.com)
+#
+import codecs
+import re
+
+from mo_sql_parsing.lexer import COMMENTS, IDENT, QUOTES
+
+# MAP FROM OPENER TO (PATTERN THAT ENDS THE QUOTE OR COMMENT, ONCE WE ARE IN IT, CHARACTERS TO RESCAN)
+# A BODY MATCHED TO THE END OF THE BUFFER STOPS BETWEEN WHOLE ESCAPES (eg '') SO THE ONLY TEXT THAT MAY READ
+# DIFFERENTLY ONCE MORE ARRIVES IS THE START OF A CLOSER (eg THE * OF */), WHICH IS ONE CHARACTER SHORTER THAN IT
+_closers = {
+    opener: (re.compile(f"{body}(?P<close>{closer})?"), len(closer.replace("\\", "")) - 1)
+    for opener, (body, closer) in {**QUOTES, **COMMENTS}.items()
+}
+_openers = "|".join(re.escape(opener) for opener in sorted(_closers, key=len, reverse=True))
+_routines = {"procedure", "function", "trigger", "event"}  # CREATE OF THESE HAS A BODY WITH BEGIN/END BLOCKS
+_transaction = {"transaction", "tran", "work"}  # BEGIN TRANSACTION IS NOT A BLOCK
+_not_counted = {"if", "loop", "while", "repeat", "for"}  # END IF, END LOOP: THEIR START IS NOT COUNTED
+_tokens = {}  # MAP FROM DELIMITER TO TOKEN PATTERN
+
+
+def _token_pattern(delimiter):
+    pattern = _tokens.get(delimiter)
+    if pattern:
+        return pattern
+    opener = _openers
+    if delimiter == ";":
+        ender = ";"
+        # DOLLAR QUOTES, eg $$ OR $body$; NOT WITH OTHER DELIMITERS, WHICH ARE OFTEN $$
+        opener += r"|\$(?:[A-Za-z_][A-Za-z_0-9]*)?\$"
+    else:
+        # SAME AS parse_delimiters(): DELIMITER MUST END THE LINE
+        ender = re.escape(delimiter) + r"[^\S\n]*(?=\n|\Z)"
+    pattern = _tokens[delimiter] = re.compile(
+        "|".join([
+            f"(?P<open>{opener})",
+            r"(?P<command>(?<![^\n])[^\S\n]*delimiter[^\S\n]+(?P<new>\S[^\n]*?)[^\S\n]*(?=\n|\Z))",
+            f"(?P<delimiter>{ender})",
+            f"(?P<word>{IDENT}+)",
+        ]),
+        re.IGNORECASE,
+    )
+    return pattern
+
+
+def _closer(opener):
+    pattern = _closers.get(opener)
+    if pattern:
+        return pattern
+    # DOLLAR QUOTE ENDS WITH THE SAME TAG
+    tag = re.escape(opener)
+    pattern = _closers[opener] = re.compile(f"(?:(?!{tag}).)*(?P<close>{tag})?", re.DOTALL), len(opener) - 1
+    return pattern
+
+
+class StatementSplitter(object):
+    """
+    SPLIT SQL INTO STATEMENTS, AS IT ARRIVES, PIECE BY PIECE
+    FOLLOWS DELIMITER COMMANDS, LIKE parse_delimiters(), BUT ALSO SPLITS ON ; SO ONLY THE CURRENT
+    STATEMENT IS KEPT IN MEMORY (parse_delimiters() LEAVES ; FOR THE PARSER)
+    DOES NOT SPLIT INSIDE QUOTES ('', "", ``, [], $$ AND $tag$), COMMENTS, OR THE BEGIN/END BLOCKS
+    OF A CREATE PROCEDURE, FUNCTION, TRIGGER OR EVENT
+    """
+
+    def __init__(self, delimiter=";", max_size=None):
+        """
+        :param delimiter: delimiter to start with
+        :param max_size: characters a statement may have before it is dropped (default no limit), so an unclosed
+                         quote can not pull the rest of the SQL into memory
+        """
+        self.buffer = ""  # UNSCANNED TEXT, AND THE ONE CHARACTER BEFORE IT
+        self.offset = 0  # SOURCE OFFSET OF buffer[0]
+        self.position = 0  # buffer[:position] IS SCANNED
+        self.start = 0  # START OF THE CURRENT STATEMENT IN buffer
+        self.begin = 0  # SOURCE OFFSET OF THE CURRENT STATEMENT
+        self.done = []  # TEXT OF THE CURRENT STATEMENT THAT IS NO LONGER IN buffer
+        self.done_size = 0  # CHARACTERS IN done
+        self.inside = None  # PATTERN THAT ENDS THE QUOTE OR COMMENT WE ARE IN
+        self.back = 0  # CHARACTERS TO RESCAN, WHEN A PIECE ENDS INSIDE, AS THEY MAY START THE CLOSER
+        self.first = None  # FIRST WORD OF THE CURRENT STATEMENT
+        self.routine = False  # CURRENT STATEMENT CREATES A PROCEDURE, FUNCTION, TRIGGER OR EVENT
+        self.depth = 0  # NESTING OF BEGIN AND CASE, IN A ROUTINE
+        self.pending = None  # "begin" OR "end", WAITING ON THE NEXT WORD
+        self.delimiter = delimiter
+        self.tokens = _token_pattern(delimiter)
+        self.max_size = max_size
+
+    def feed(self, text):
+        """
+        :param text: next piece of the SQL
+        :return: list of (start, end, statement) for the statements text completes; statement is None
+                 for a statement dropped for being over max_size
+        """
+        self.buffer += text
+        output = self._scan(final=False)
+        self._compact()
+        if self.max_size is not None and self.done_size + len(self.buffer) - self.start > self.max_size:
+            output.append(self._drop())
+        return output
+
+    def close(self):
+        """
+        :return: list of (start, end, statement) for the rest of the SQL
+        """
+        output = self._scan(final=True)
+        _add(output, self._emit(len(self.buffer), len(self.buffer)))
+        return output
+
+    def _scan(self, final):
+        output = []
+        while True:
+            buffer = self.buffer
+            size = len(buffer)
+            if self.inside:
+                found = self.inside.match(buffer, self.position)
+                if found.end() == size and not final:
+                    if found.group("close") is None:
+                        # STILL INSIDE; RESCAN THE LAST CHARACTERS, THEY MAY START THE CLOSER
+                        self.position = max(self.position, size - self.back)
+                    return output
+                self.inside = None
+                self.position = found.end()
+
+            for found in self.tokens.finditer(buffer, self.position):
+                if found.end() == size and not final:
+                    # TOKEN MAY CONTINUE IN THE NEXT PIECE
+                    return output
+                kind = found.lastgroup
+                if kind == "word" and not final and found.group(0).lower() == "delimiter":
+                    if buffer.find("\n", found.end()) == -1:
+                        # MAY BE A DELIMITER COMMAND, ONCE WE HAVE THE WHOLE LINE
+                        return output
+                self.position = found.end()
+                if kind == "word":
+                    self._word(found.group(0).lower())
+                elif kind == "open":
+                    self.inside, self.back = _closer(found.group(0))
+                    break
+                elif kind == "delimiter":
+                    if self.pending == "end":
+                        self.depth = max(0, self.depth - 1)
+                    self.pending = None
+                    if self.depth and self.delimiter == ";":
+                        continue
+                    _add(output, self._emit(found.start(), found.end()))
+                else:
+                    # DELIMITER COMMAND IS A STATEMENT OF ITS OWN
+                    _add(output, self._emit(found.start(), found.start()))
+                    _add(output, self._emit(found.end(), found.end()))
+                    self.delimiter = found.group("new")
+                    self.tokens = _token_pattern(self.delimiter)
+                    break
+            else:
+                return output
+
+    def _word(self, word):
+        if self.first is None:
+            self.first = word
+            return
+        if not self.routine:
+            # BEGIN OUTSIDE A ROUTINE (eg BEGIN ISOLATION LEVEL ...) IS NOT A BLOCK
+            self.routine = self.first == "create" and word in _routines
+            return
+        pending, self.pending = self.pending, None
+        if pending == "begin":
+            if word not in _transaction:
+                self.depth += 1
+        elif pending == "end":
+            if word in _not_counted:
+                return
+            self.depth = max(0, self.depth - 1)
+            if word == "case":
+                # END CASE
+                return
+        if word in ("begin", "end"):
+            self.pending = word
+        elif word == "case":
+            self.depth += 1
+
+    def _emit(self, end, next_start):
+        text = "".join(self.done) + self.buffer[self.start : end]
+        begin = self.begin
+        self.done = []
+        self.done_size = 0
+        self.start = next_start
+        self.begin = self.offset + next_start
+        self.first = None
+        self.routine = False
+        self.depth = 0
+        self.pending = None
+
+        statement = text.strip()
+        if not statement:
+            return None
+        begin += len(text) - len(text.lstrip())
+        return begin, begin + len(statement), statement
+
+    def _drop(self):
+        # GIVE UP ON THE CURRENT STATEMENT; SCANNING STARTS AGAIN, AS A NEW STATEMENT, AFTER THE TEXT SEEN SO FAR
+        size = len(self.buffer)
+        begin, end = self.begin, self.offset + size
+        for part in self.done + [self.buffer[self.start :]]:
+            # SAME START AS _emit() WOULD GIVE, WITHOUT THE LEADING WHITESPACE
+            stripped = part.lstrip()
+            begin += len(part) - len(stripped)
+            if stripped:
+                break
+        self.done = []
+        self.done_size = 0
+        self.start = self.position = size
+        self.begin = end
+        self.inside = None
+        self.first = None
+        self.routine = False
+        self.depth = 0
+        self.pending = None
+        self._compact()
+        return begin, end, None
+
+    def _compact(self):
+        # KEEP ONE CHARACTER BEFORE position, SO DELIMITER COMMANDS CAN CHECK FOR LINE START
+        drop = self.position - 1
+        if drop <= 0:
+            return
+        if self.start < drop:
+            self.done.append(self.buffer[self.start : drop])
+            self.done_size += drop - self.start
+            self.start = 0
+        else:
+            self.start -= drop
+        self.buffer = self.buffer[drop:]
+        self.offset += drop
+        self.position -= drop
+
+
+def _add(output, statement):
+    if statement:
+        output.append(statement)
+
+
+def read_pieces(source, size=1 << 16):
+    """
+    :param source: str, file object (text or binary), or iterable of str or bytes
+    :param size: number of characters (or bytes) to read from a file object at a time
+    :return: generator of str
+    """
+    if isinstance(source, str):
+        yield source
+        return
+
+    read = getattr(source, "read", None)
+    if read:
+
+        def chunks():
+            while True:
+                chunk = read(size)
+                if not chunk:
+                    return
+                yield chunk
+
+        source = chunks()
+
+    decoder = None
+    for piece in source:
+        if isinstance(piece, (bytes, bytearray)):
+            decoder = decoder or codecs.getincrementaldecoder("utf8")()
+            piece = decoder.decode(piece)
+        yield piece
+    if decoder:
+        yield decoder.decode(b"", final=True)
@@ -0,0 +1,252 @@
+# encoding: utf-8
+#
+# This Source Code Form is subject to the terms of the Mozilla Public
+# License, v. 2.0. If a copy of the MPL was not distributed with this file,
+# You can obtain one at http://mozilla.org/MPL/2.0/.
+#
+# Contact: Kyle Lahnakoski (kyle@lahnakoski.com)
+#
+import re
+
+from mo_sql_parsing.cache import ParseCache
+from mo_sql_parsing.lexer import COMMENTS, QUOTES, quoted
+from mo_sql_parsing.utils import IDENT_CHAR, ansi_string, hex_num, int_pos, real_pos, parse_int, single_literal
+
+
+class TemplateCache(ParseCache):
+    """
+    CACHE KEYED ON THE SHAPE OF THE SQL: THE TEXT WITH ITS LITERALS REMOVED
+
+    ON A MISS, THE SQL IS PARSED, AND THE SHAPE IS PARSED A SECOND TIME WITH
+    SENTINEL LITERALS.  IF PUTTING THE REAL LITERALS BACK INTO THE SENTINEL TREE
+    GIVES THE REAL PARSE TREE, THEN THE SENTINEL TREE IS KEPT AS A TEMPLATE FOR
+    THE SHAPE.  OTHERWISE, THE SHAPE IS REMEMBERED AS NOT CACHEABLE.
+    """
+
+    def parse(self, options, sql, parse):
+        try:
+            # LEXING CONVERTS LITERALS THE GRAMMAR MAY REJECT (eg 1e400); LET parse() RAISE ITS OWN ERROR
+            shape = lex_literals(sql)
+        except Exception:
+            shape = None
+        if shape is None:
+            self._count(False)
+            return parse(sql)
+
+        key = (options, shape.key)
+        found, template = self._lookup(key)
+        self._count(found and template is not _not_cacheable)
+        if found:
+            if template is not _not_cacheable:
+                try:
+                    output, _ = template.bind(shape.values)
+                    return output
+                except Exception:
+                    pass
+            return parse(sql)
+
+        output = parse(sql)
+        try:
+            template = Template(parse(shape.probe), len(shape.values))
+            expected, used = template.bind(shape.values)
+            if expected != output or len(used) != len(shape.values):
+                template = _not_cacheable
+        except Exception:
+            template = _not_cacheable
+        self._store(key, template)
+        return output
+
+
+class Template(object):
+    __slots__ = ["tree", "slots"]
+
+    def __init__(self, tree, num_values):
+        self.tree = tree
+        self.slots = {}  # MAP FROM (type, sentinel) TO (index, negate)
+        for i, s in enumerate(_sentinels(num_values)):
+            for sentinel in s:
+                self.slots[(type(sentinel), sentinel)] = (i, False)
+                if not isinstance(sentinel, str):
+                    self.slots[(type(sentinel), -sentinel)] = (i, True)
+
+    def bind(self, values):
+        """
+        :return: (tree, set of value indexes used)
+        """
+        used = set()
+        return _bind(self.tree, self.slots, values, used), used
+
+
+def _bind(tree, slots, values, used):
+    if isinstance(tree, dict):
+        return {k: _bind(v, slots, values, used) for k, v in tree.items()}
+    elif isinstance(tree, list):
+        if len(tree) == 2:
+            first = slots.get(_slot_key(tree[0]))
+            if first and isinstance(values[first[0]], list) and slots.get(_slot_key(tree[1])) == first:
+                # IN LIST OF LITERALS
+                used.add(first[0])
+                return list(values[first[0]])
+        return [_bind(v, slots, values, used) for v in tree]
+    else:
+        slot = slots.get(_slot_key(tree))
+        if not slot:
+            return tree
+        index, negate = slot
+        value = values[index]
+        if isinstance(value, list):
+            # SECOND ITEM OF AN IN LIST
+            return tree
+        used.add(index)
+        return -value if negate else value
+
+
+def _slot_key(value):
+    if isinstance(value, (str, int, float)):
+        return type(value), value
+
+
+_not_cacheable = object()
+INT_SENTINEL = 8_675_309_000_000
+FLOAT_SENTINEL = 1_234_567.25
+
+
+def _sentinels(num_values):
+    """
+    SENTINEL VALUES THAT MAY SHOW UP IN THE PARSE TREE FOR LITERAL i
+    """
+    for i in range(num_values):
+        yield (
+            INT_SENTINEL + 2 * i,
+            INT_SENTINEL + 2 * i + 1,
+            FLOAT_SENTINEL + i,
+            f"\x01{2 * i}\x01",
+            f"\x01{2 * i + 1}\x01",
+        )
+
+
+class Shape(object):
+    __slots__ = ["key", "probe", "values"]
+
+    def __init__(self, key, probe, values):
+        self.key = key  # SQL WITH LITERALS REPLACED BY PLACEHOLDERS
+        self.probe = probe  # SQL WITH LITERALS REPLACED BY SENTINELS
+        self.values = values  # THE LITERAL VALUES, IN ORDER
+
+
+def _pattern(element):
+    return element.__regex__()[1]
+
+
+_ident_char = "[" + re.escape("".join(sorted(IDENT_CHAR))) + "]"
+_not_after = f"(?<!{_ident_char})(?<!\\.)"
+_not_before = f"(?!{_ident_char})(?!\\.)"
+_string = f"(?<!{_ident_char}){_pattern(ansi_string)}"
+_number = f"{_not_after}(?P<real>{_pattern(real_pos)}){_not_before}|{_not_after}(?P<int>{_pattern(int_pos)}){_not_before}"
+_any_number = f"{_not_after}(?:{_pattern(real_pos)}|{_pattern(int_pos)}){_not_before}"
+_single = "'" + QUOTES["'"][0] + "'"
+_comment = "|".join(quoted(c) for c in COMMENTS)
+_quoted = "|".join(quoted(q) for q in QUOTES if q != "'")
+
+_tokens = re.compile(
+    "|".join([
+        f"(?P<comment>{_comment})",
+        # QUOTED IDENTIFIERS, AND STRINGS WE DO NOT LEX, STAY IN THE KEY
+        f"(?P<quoted>{_quoted})",
+        f"(?P<string>{_string})",
+        "(?P<other_string>" + quoted("'") + ")",
+        f"(?P<hex>{_pattern(hex_num)})",
+        f"(?P<number>{_number})",
+        r"(?P<in>(?<![\w.])in\s*\()",
+        f"(?P<word>{_ident_char}+)",
+    ]),
+    re.DOTALL | re.IGNORECASE,
+)
+_in_list = re.compile(
+    rf"\s*(?:{_single}|{_any_number})(?:\s*,\s*(?:{_single}|{_any_number}))+\s*\)", re.DOTALL,
+)
+_list_item = re.compile(rf"(?P<string>{_single})|{_number}", re.DOTALL)
+
+# LITERALS IN THESE STATEMENTS CAN CHANGE THE SHAPE OF THE PARSE TREE
+_value_sensitive = re.compile(r"\b(?:interval|explain|describe|delimiter)\b|^\s*desc\b", re.IGNORECASE)
+
+
+def lex_literals(sql):
+    """
+    :return: Shape OF sql, OR None IF LITERALS CAN NOT BE REMOVED SAFELY
+    """
+    key, probe, values = [], [], []
+    end = 0
+    for found in _tokens.finditer(sql):
+        if found.start() < end:
+            # INSIDE AN IN LIST WE ALREADY TOOK
+            continue
+        kind = found.lastgroup
+        if kind == "string":
+            text = found.group(0)
+            if ";" in text or "\n" in text:
+                # parse_delimiters() MAY SPLIT ON THESE
+                continue
+            value = single_literal([text])["literal"]
+            start = text.index("'")
+            placeholder = f"\x00{text[:start].lower()}s{'' if value else '0'}\x00"
+            sentinel = f"{text[:start]}'\x01{2 * len(values)}\x01'"
+        elif kind == "number":
+            text = found.group(0)
+            if found.group("real") is not None:
+                value = float(text)
+                placeholder = f"\x00f{'' if value else '0'}\x00"
+                sentinel = repr(FLOAT_SENTINEL + len(values))
+            else:
+                value = parse_int([text])
+                placeholder = f"\x00i{'' if value else '0'}\x00"
+                sentinel = str(INT_SENTINEL + 2 * len(values))
+        elif kind == "in":
+            items = _in_list.match(sql, found.end())
+            if not items:
+                continue
+            value, is_string = _list_values(items.group(0))
+            if value is None:
+                continue
+            key.append(sql[end : found.end()])
+            probe.append(sql[end : found.end()])
+            if is_string:
+                key.append("\x00S\x00)")
+                probe.append(f"'\x01{2 * len(values)}\x01', '\x01{2 * len(values) + 1}\x01')")
+            else:
+                key.append("\x00N\x00)")
+                probe.append(f"{INT_SENTINEL + 2 * len(values)}, {INT_SENTINEL + 2 * len(values) + 1})")
+            values.append(value)
+            end = items.end()
+            continue
+        else:
+            continue
+        key.append(sql[end : found.start()])
+        probe.append(sql[end : found.start()])
+        key.append(placeholder)
+        probe.append(sentinel)
+        values.append(value)
+        end = found.end()
+
+    if not values:
+        return None
+    key.append(sql[end:])
+    probe.append(sql[end:])
+    key = "".join(key)
+    if _value_sensitive.search(key):
+        return None
+    return Shape(key, "".join(probe), values)
+
+
+def _list_values(text):
+    """
+    :return: (list of values, is_string) OR (None, None) IF NOT ALL OF ONE KIND
+    """
+    items = list(_list_item.finditer(text))
+    if all(i.group("string") for i in items):
+        values = [single_literal([i.group(0)])["literal"] for i in items]
+        if all(values) and not any(";" in i.group(0) or "\n" in i.group(0) for i in items):
+            return values, True
+    elif not any(i.group("string") for i in items):
+        return [float(i.group(0)) if i.group("real") else parse_int([i.group(0)]) for i in items], False
+    return None, None
@@ -9,6 +9,7 @@
 
 import ast
 import sys
+from threading import local
 
 from mo_dots import is_data, is_null, literal_field, unliteral_field
 from mo_future import text, number_types, binary_type, flatten
@@ -38,8 +39,6 @@ IDENT_CHAR = Regex("[@_$0-9A-Za-zÀ-ÖØ-öø-ƿ]").expr.parser_config.include
 FIRST_IDENT_CHAR = "".join(set(IDENT_CHAR) - set("0123456789"))
 SQL_NULL = Call("null", [], {})
 
-null_locations = []
-
 
 def keyword(keywords):
     return And([Keyword(k, caseless=True) for k in keywords.split(" ")]).set_parser_name(keywords) / keywords.replace(
@@ -58,11 +57,42 @@ def assign(key: str, value: ParserElement):
     return keyword(key).suppress() + Group(value)(key.replace(" ", "_"))
 
 
-scrub_op = simple_op
-fmap = {}
+class ScrubContext(object):
+    """
+    PER-PARSE STATE FOR scrub(), SO CONCURRENT PARSES DO NOT SHARE ANYTHING
+    WHILE ENTERED, scrub() CALLS WITHOUT A CONTEXT (THE ONES MADE BY PARSE ACTIONS) USE ITS op AND fmap
+    """
+
+    __slots__ = ["op", "fmap", "null", "previous"]
+
+    def __init__(self, op=simple_op, fmap=None, null=SQL_NULL):
+        self.op = op
+        self.fmap = fmap or {}
+        self.null = null  # WRITTEN WHEREVER SQL_NULL IS PUT IN THE OUTPUT
+        self.previous = None
+
+    def __enter__(self):
+        self.previous = scrub_state.context
+        # PARSE ACTIONS KEEP SQL_NULL, SO THE FINAL scrub() STILL SEES, AND REPLACES, IT
+        scrub_state.context = ScrubContext(self.op, self.fmap)
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        scrub_state.context = self.previous
+        self.previous = None
+
+
+class _ScrubState(local):
+    context = None  # ScrubContext FOR THE PARSE ACTIONS RUNNING ON THIS THREAD
+
 
+scrub_state = _ScrubState()
+
+
+def scrub(result, context=None):
+    if context is None:
+        context = scrub_state.context or ScrubContext()
 
-def scrub(result):
     if result is SQL_NULL:
         return SQL_NULL
     elif result == None:
@@ -74,16 +104,17 @@ def scrub(result):
     elif isinstance(result, number_types):
         return result
     elif isinstance(result, Call):
-        kwargs = scrub(result.kwargs)
-        args = scrub(result.args)
-        op = result.op
+        kwargs = scrub(result.kwargs, context)
+        args = scrub(result.args, context)
+        op = context.fmap.get(result.op, result.op)
+        output = context.op(op, args, kwargs)
         if args is SQL_NULL:
-            null_locations.append((kwargs, op))
-        return scrub_op(fmap.get(op, op), args, kwargs)
+            kwargs[op] = context.null
+        return output
     elif isinstance(result, dict) and not result:
         return result
     elif isinstance(result, list):
-        output = [rr for r in result for rr in [scrub(r)] if rr is not None]
+        output = [rr for r in result for rr in [scrub(r, context)] if rr is not None]
 
         if not output:
             return None
@@ -92,7 +123,7 @@ def scrub(result):
         else:
             for i, v in enumerate(output):
                 if v is SQL_NULL:
-                    null_locations.append((output, i))
+                    output[i] = context.null
             return output
     else:
         # ATTEMPT A DICT INTERPRETATION
@@ -100,13 +131,13 @@ def scrub(result):
             kv_pairs = list(result.items())
         except Exception as c:
             print(c)
-        output = {k: vv for k, v in kv_pairs for vv in [scrub(v)] if not is_null(vv)}
+        output = {k: vv for k, v in kv_pairs for vv in [scrub(v, context)] if not is_null(vv)}
         if isinstance(result, dict) or output:
             for k, v in output.items():
                 if v is SQL_NULL:
-                    null_locations.append((output, k))
+                    output[k] = context.null
             return output
-        return scrub(list(result))
+        return scrub(list(result), context)
 
 
 def _chunk(values, size):
@@ -192,7 +223,12 @@ def to_json_operator(tokens):
                     operand = operand[0]
 
             if isinstance(operand, Call) and operand.op == op:
-                acc.extend(operand.args)
+                if not acc and tokens.tokens[0].type is tokens.type:
+                    # THE PREVIOUS STEP OF THIS CHAIN BUILT THE LEFT OPERAND, AND ITS LIST, SO NOTHING ELSE SEES THEM;
+                    # GROW THE LIST, DO NOT COPY IT AGAIN. OTHER OPERANDS (eg A PARENTHESIZED (a + b)) MAY BE SHARED
+                    acc = operand.args
+                else:
+                    acc.extend(operand.args)
             elif isinstance(operand, list):
                 acc.append(operand)
             elif isinstance(operand, dict) and operand.get(op):
@@ -330,7 +366,8 @@ def to_json_call(tokens):
         for kv in list(more_kwargs):
             kwargs.update(kv)
 
-    return ParseResults(tokens.type, tokens.start, tokens.end, [Call(op, args, kwargs)], tokens.failures,)
+    # NO failures: THE PARSE ACTION WRAPPER ADDS tokens.failures, AND SHARING THE LIST WOULD DOUBLE IT
+    return ParseResults(tokens.type, tokens.start, tokens.end, [Call(op, args, kwargs)], [])
 
 
 def to_option(tokens):
@@ -500,7 +537,7 @@ def to_expression_call(tokens):
     if set(tokens.keys()) & {"over", "within", "filter"}:
         return
 
-    return ParseResults(tokens.type, tokens.start, tokens.end, listwrap(tokens["value"]), tokens.failures,)
+    return ParseResults(tokens.type, tokens.start, tokens.end, listwrap(tokens["value"]), [])
 
 
 def to_over(tokens):
@@ -0,0 +1,400 @@
+# encoding: utf-8
+#
+# This Source Code Form is subject to the terms of the Mozilla Public
+# License, v. 2.0. If a copy of the MPL was not distributed with this file,
+# You can obtain one at http://mozilla.org/MPL/2.0/.
+#
+# Author: Kyle Lahnakoski (kyle@lahnakoski.com)
+#
+"""
+BENCHMARK parse() AND format() OVER THE BUNDLED CORPORA, AND OVER GENERATED QUERIES
+
+    python tests/bench.py [--suites corpora,in_list] [--dialects common,mysql] [--limit 500] [--save new.json] [--baseline old.json] [--max-slowdown 0.1]
+
+SUITES:
+    corpora     - parse (each dialect) and format the Stack Overflow queries, the Sakila script, the big statements,
+                  and the DDL/DML tests
+    comments    - queries with a comment around every token, like those dbt and ORMs generate
+    expressions - arithmetic, conditions and function calls
+    in_list     - IN (...) lists of 1k to 100k literals
+    chains      - a OR b OR ..., and a + b + ..., of 500 to 2k terms
+    bulk_insert - mysqldump-style INSERT ... VALUES, with and without the bulk insert fast path
+    cold_start  - a new process to import and parse "select 1", for each dialect, with and without the grammar cache
+
+REPORTS THROUGHPUT (statements/sec, MB/sec), LATENCY (p50/p95/p99) AND PEAK MEMORY OF ONE STATEMENT, OVER THE
+STATEMENTS THAT DID NOT RAISE; THE ERRORS ARE COUNTED
+WITH --baseline, EXITS WITH 1 IF ANY THROUGHPUT, OR COLD START, IS WORSE THAN THE BASELINE BY MORE THAN
+--max-slowdown, OR IF THE NUMBER OF ERRORS CHANGED
+"""
+import argparse
+import ast
+import io
+import json
+import os
+import platform
+import subprocess
+import sys
+import tarfile
+import tempfile
+import tracemalloc
+from statistics import median
+from time import perf_counter
+from unittest.mock import patch
+
+TESTS = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.dirname(TESTS))  # SO THIS RUNS FROM A CHECKOUT, WITHOUT PYTHONPATH
+
+from mo_sql_parsing import bulk, parse, parse_mysql, parse_sqlserver, parse_bigquery, format, split_statements
+
+PARSERS = {"common": parse, "mysql": parse_mysql, "sqlserver": parse_sqlserver, "bigquery": parse_bigquery}
+PERCENTILES = [50, 95, 99]
+RUNS = 20  # TIMES EACH GENERATED QUERY IS PARSED
+
+COLD_START = """
+import sys
+from time import perf_counter
+start = perf_counter()
+import mo_sql_parsing
+if sys.argv[2]:
+    mo_sql_parsing.enable_grammar_cache(sys.argv[2])
+getattr(mo_sql_parsing, sys.argv[1])("select 1")
+print(perf_counter() - start)
+"""
+
+
+def so_queries():
+    """
+    :return: the Stack Overflow queries, one per file in the archive
+    """
+    import zstandard
+
+    with open(os.path.join(TESTS, "so_queries", "so_queries.tar.zst"), "rb") as file:
+        content = zstandard.ZstdDecompressor().stream_reader(file).read()
+    with tarfile.open(fileobj=io.BytesIO(content)) as archive:
+        members = sorted((m for m in archive.getmembers() if m.isfile()), key=lambda m: m.name)
+        return [archive.extractfile(m).read().decode("utf8").strip() for m in members]
+
+
+def issue_218():
+    """
+    :return: the statements of the Sakila schema script
+    """
+    with open(os.path.join(TESTS, "mysql", "issue_218.sql"), encoding="utf8") as file:
+        statements = split_statements(file.read())
+    return [s for s in statements if s.strip() and not s.strip().lower().startswith("delimiter")]
+
+
+def sql_in(*names):
+    """
+    :param names: test files
+    :return: the SQL assigned to `sql`, or given to parse...(), in the tests
+    """
+    output = []
+    for name in names:
+        with open(os.path.join(TESTS, name), encoding="utf8") as file:
+            tree = ast.parse(file.read())
+        for node in ast.walk(tree):
+            if isinstance(node, ast.Assign) and any(isinstance(t, ast.Name) and t.id == "sql" for t in node.targets):
+                value = node.value
+            elif (
+                isinstance(node, ast.Call)
+                and isinstance(node.func, ast.Name)
+                and node.func.id.startswith("parse")
+                and node.args
+            ):
+                value = node.args[0]
+            else:
+                continue
+            if isinstance(value, ast.Constant) and isinstance(value.value, str):
+                output.append(value.value)
+    return output
+
+
+CORPORA = {
+    "so_queries": so_queries,
+    "issue_218": issue_218,
+    "big_sql": lambda: sql_in("test_big_sql.py"),
+    "ddl_dml": lambda: sql_in("test_commands.py", "test_snowflake.py"),
+}
+
+
+def comments():
+    columns = 40
+    yield "plain", parse, "select " + ", ".join(f"c{i}" for i in range(columns)) + " from t where a = 1"
+    yield "line", parse, (
+        "-- generated by a tool, do not edit\n"
+        + "select\n"
+        + "\n".join(f"    {',' if i else ' '} c{i}  -- column {i} of the source table" for i in range(columns))
+        + "\nfrom t  -- the source\nwhere a = 1  -- the filter\n"
+    )
+    yield "block", parse, (
+        '/* {"app": "orm", "file": "models.py", "line": 1234} */\n'
+        + "select "
+        + ", ".join(f"/* field {i} */ c{i} /* : int */" for i in range(columns))
+        + " from /* table */ t where /* filter */ a = 1"
+    )
+    yield "mixed", parse, (
+        "/*\n * header\n * block\n */\n"
+        + "select\n"
+        + ",\n".join(f"    -- {i}\n    /* x */ c{i} /* trailing */" for i in range(columns))
+        + "\nfrom t\n/* where */ where a = 1 -- done"
+    )
+
+
+def expressions():
+    yield "identifiers", parse, "select a, b, c, d, e, f, g, h, i, j from t"
+    yield "arithmetic", parse, "select a + b * c - d / e % f, -(g + h) * (i - j) / 2, a * b + c * d - e * f from t"
+    yield "conditions", parse, (
+        "select a from t where a = 1 and b <> 2 or c >= 3 and not d < 4 and e between 5 and 6"
+        " and f like 'x%' and g in (1, 2, 3) and h is not null and i || j = 'k'"
+    )
+    yield "functions", parse, (
+        "select coalesce(a, b, 0) + sum(c * d) over (partition by e order by f) - cast(g as int),"
+        " case when h > 0 then i else j end, x.y.z[1], upper(trim(k)) from t"
+    )
+
+
+def in_list():
+    for size in [1_000, 10_000, 100_000]:
+        numbers = ", ".join(str(i) for i in range(size))
+        strings = ", ".join(f"'id-{i}'" for i in range(size))
+        yield f"numbers {size}", parse, f"SELECT a FROM t WHERE a IN ({numbers})"
+        yield f"strings {size}", parse, f"SELECT a FROM t WHERE a IN ({strings})"
+
+
+def chains():
+    for size in [500, 1_000, 2_000]:
+        yield f"or {size}", parse, "SELECT a FROM t WHERE " + " OR ".join(f"x{i} = {i}" for i in range(size))
+        yield f"add {size}", parse, "SELECT " + " + ".join(f"x{i}" for i in range(size))
+
+
+def dump(rows):
+    return "INSERT INTO `orders` VALUES " + ",".join(
+        f"({i + 1},'customer {i % 997}',{i % 50 + 1},{(i % 1000) / 4 + 0.25},'2023-01-{i % 28 + 1:02d}')"
+        for i in range(rows)
+    )
+
+
+def full_grammar(sql):
+    with patch.object(bulk, "MIN_ROWS", float("inf")):
+        return parse_mysql(sql)
+
+
+def bulk_insert():
+    yield "1000 rows", parse_mysql, dump(1_000)
+    yield "1000 rows, full grammar", full_grammar, dump(1_000)
+    yield "100000 rows", parse_mysql, dump(100_000)
+
+
+# MAP FROM NAME TO (GENERATOR OF (name, function, sql), TIMES TO RUN EACH sql)
+SUITES = {
+    "comments": (comments, RUNS),
+    "expressions": (expressions, RUNS),
+    "in_list": (in_list, 1),
+    "chains": (chains, 1),
+    "bulk_insert": (bulk_insert, 1),
+}
+ALL_SUITES = ["corpora", *SUITES, "cold_start"]
+
+
+def sample(statements, limit):
+    """
+    :return: at most limit statements, spread evenly over the corpus
+    """
+    if not limit or len(statements) <= limit:
+        return statements
+    step = len(statements) / limit
+    return [statements[int(i * step)] for i in range(limit)]
+
+
+def measure(func, inputs, sizes):
+    """
+    :param func: function to run on each input
+    :param inputs: list of inputs
+    :param sizes: bytes of each input, for MB/sec
+    :return: (outputs, stats); an input that raises gets None as its output, is counted in errors, and is
+             left out of the rest of the stats
+    """
+    outputs, timing, done = [], [], []
+    for i in inputs:
+        start = perf_counter()
+        try:
+            output = func(i)
+        except Exception:
+            outputs.append(None)
+            continue
+        timing.append(perf_counter() - start)
+        outputs.append(output)
+        done.append(i)
+
+    peak = 0
+    for i in done:
+        tracemalloc.start()
+        try:
+            func(i)
+        finally:
+            peak = max(peak, tracemalloc.get_traced_memory()[1])
+            tracemalloc.stop()
+
+    total = sum(timing) or 1e-9
+    size = sum(n for n, o in zip(sizes, outputs) if o is not None)
+    timing.sort()
+    stats = {
+        "statements": len(inputs),
+        "errors": len(inputs) - len(done),
+        "seconds": total,
+        "statements_per_sec": len(done) / total,
+        "mb_per_sec": size / total / 1_000_000,
+        "peak_kb": peak / 1000,
+    }
+    for p in PERCENTILES:
+        stats[f"p{p}_ms"] = timing[min(len(timing) - 1, int(len(timing) * p / 100))] * 1000 if timing else 0
+    return outputs, stats
+
+
+def cold_start(dialect, runs, directory=""):
+    """
+    :param directory: grammar cache directory, or "" for none
+    :return: median seconds for a new process to import mo_sql_parsing and parse "select 1" in dialect
+    """
+    project = os.path.dirname(TESTS)
+    env = dict(os.environ, PYTHONPATH=os.pathsep.join([project, os.environ.get("PYTHONPATH", "")]))
+    name = PARSERS[dialect].__name__
+    timing = []
+    for _ in range(runs):
+        output = subprocess.run(
+            [sys.executable, "-c", COLD_START, name, directory], env=env, stdout=subprocess.PIPE, check=True
+        ).stdout
+        timing.append(float(output))
+    return median(timing)
+
+
+def run(suites, dialects, limit, cold_runs):
+    """
+    :return: results, as saved to JSON
+    """
+    results = {}
+
+    def record(name, func, inputs, sizes):
+        outputs, stats = measure(func, inputs, sizes)
+        results[name] = stats
+        print_stats(name, stats)
+        return outputs
+
+    if "corpora" in suites:
+        for corpus, load in CORPORA.items():
+            statements = sample(load(), limit)
+            sizes = [len(s.encode("utf8")) for s in statements]
+            for dialect in dialects:
+                parser = PARSERS[dialect]
+                parser("select 1")  # BUILD THE GRAMMAR FIRST
+                trees = record(f"{corpus}/{dialect}/parse", parser, statements, sizes)
+                # FORMAT THE TREES THAT PARSED; MB/sec IS OF THE SQL THEY CAME FROM
+                parsed = [(t, n) for t, n in zip(trees, sizes) if t is not None]
+                record(f"{corpus}/{dialect}/format", format, [t for t, _ in parsed], [n for _, n in parsed])
+
+    for suite, (generate, runs) in SUITES.items():
+        if suite not in suites:
+            continue
+        parse_mysql("select 1")  # BUILD THE GRAMMARS FIRST
+        parse("select 1")
+        for name, func, sql in generate():
+            record(f"{suite}/{name}", func, [sql] * runs, [len(sql.encode("utf8"))] * runs)
+
+    cold = {}
+    if "cold_start" in suites:
+        with tempfile.TemporaryDirectory() as directory:
+            for dialect in dialects:
+                cold[dialect] = cold_start(dialect, cold_runs)
+                print(f"{'cold start/' + dialect:32} {cold[dialect]:8.3f} seconds")
+                cold_start(dialect, 1, directory)  # WRITE THE GRAMMAR CACHE
+                name = f"{dialect}/grammar cache"
+                cold[name] = cold_start(dialect, cold_runs, directory)
+                print(f"{'cold start/' + name:32} {cold[name]:8.3f} seconds")
+
+    return {
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "limit": limit,
+        "results": results,
+        "cold_start": cold,
+    }
+
+
+def print_stats(name, stats):
+    print(
+        f"{name:32} {stats['statements']:6} stmts {stats['errors']:5} errors"
+        f" {stats['statements_per_sec']:9.1f} stmt/s {stats['mb_per_sec']:7.3f} MB/s"
+        f"  p50 {stats['p50_ms']:7.2f}  p95 {stats['p95_ms']:7.2f}  p99 {stats['p99_ms']:7.2f} ms"
+        f"  peak {stats['peak_kb']:9.0f} KB"
+    )
+
+
+def compare(new, old, max_slowdown):
+    """
+    :param new: results of this run
+    :param old: results of the baseline run
+    :param max_slowdown: fraction (eg 0.1 for 10%) that throughput, or cold start, may be worse by
+    :return: list of regressions, as strings
+    """
+    regressions = []
+    for name, stats in new["results"].items():
+        before = old["results"].get(name)
+        if not before:
+            continue
+        if stats["errors"] != before["errors"]:
+            # THROUGHPUT IS OVER DIFFERENT STATEMENTS, SO IT CAN NOT BE COMPARED
+            regressions.append(f"{name} has {stats['errors']} errors, was {before['errors']}")
+            continue
+        slowdown = before["statements_per_sec"] / stats["statements_per_sec"] - 1
+        print(f"{name:32} {slowdown * 100:+7.1f}% time")
+        if slowdown > max_slowdown:
+            regressions.append(f"{name} is {slowdown * 100:.1f}% slower")
+    for name, seconds in new["cold_start"].items():
+        before = old["cold_start"].get(name)
+        if not before:
+            continue
+        slowdown = seconds / before - 1
+        print(f"{'cold start/' + name:32} {slowdown * 100:+7.1f}% time")
+        if slowdown > max_slowdown:
+            regressions.append(f"cold start/{name} is {slowdown * 100:.1f}% slower")
+    return regressions
+
+
+def main(args):
+    options = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    options.add_argument("--suites", default=",".join(ALL_SUITES), help="comma separated suites to run")
+    options.add_argument("--dialects", default=",".join(PARSERS), help="comma separated dialects to run")
+    options.add_argument("--limit", type=int, default=500, help="maximum statements from each corpus (0 for all)")
+    options.add_argument("--cold-runs", type=int, default=3, help="processes to start for the cold start time")
+    options.add_argument("--save", help="file to write the results to, as JSON")
+    options.add_argument("--baseline", help="results of an earlier run, to compare to")
+    options.add_argument("--max-slowdown", type=float, default=0.1, help="fraction slower than the baseline to fail on")
+    options = options.parse_args(args)
+
+    suites = [s.strip() for s in options.suites.split(",") if s.strip()]
+    for s in suites:
+        if s not in ALL_SUITES:
+            raise Exception(f"Expecting suite to be one of {', '.join(ALL_SUITES)}")
+    dialects = [d.strip() for d in options.dialects.split(",") if d.strip()]
+    for d in dialects:
+        if d not in PARSERS:
+            raise Exception(f"Expecting dialect to be one of {', '.join(PARSERS)}")
+
+    results = run(suites, dialects, options.limit, options.cold_runs)
+    if options.save:
+        with open(options.save, "w") as file:
+            json.dump(results, file, indent=2)
+    if options.baseline:
+        with open(options.baseline) as file:
+            baseline = json.load(file)
+        regressions = compare(results, baseline, options.max_slowdown)
+        for r in regressions:
+            print(f"REGRESSION: {r}")
+        if regressions:
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
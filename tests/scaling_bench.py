@@ -0,0 +1,173 @@
+# encoding: utf-8
+#
+# This Source Code Form is subject to the terms of the Mozilla Public
+# License, v. 2.0. If a copy of the MPL was not distributed with this file,
+# You can obtain one at http://mozilla.org/MPL/2.0/.
+#
+# Author: Kyle Lahnakoski (kyle@lahnakoski.com)
+#
+"""
+TIME TO PARSE SYNTHETIC QUERIES THAT GROW ALONG ONE AXIS AT A TIME, AND FIT THE GROWTH
+
+    python tests/scaling_bench.py [axis]
+
+EXITS WITH 1 IF ANY AXIS GROWS FASTER THAN n^LIMIT
+THE LIMIT IS FIXED, NOT FITTED TO n log n OVER THE SIZES: OVER SMALL SIZES THAT FIT IS n^1.3 OR MORE, LOOSE ENOUGH
+TO PASS A QUADRATIC; EVERY AXIS SPANS 16x, SO NOISE MOVES THE EXPONENT LITTLE
+EACH SIZE IS TIMED WITH THE GARBAGE COLLECTOR ON (WHAT CALLERS SEE, WHICH IS CHECKED), AND OFF (THE PARSER'S
+OWN GROWTH); THE DIFFERENCE IS FULL COLLECTIONS THAT SCAN THE LIVE OBJECTS OF A BIG PARSE
+"""
+import gc
+import os
+import sys
+from math import log
+from time import perf_counter
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))  # SO THIS RUNS FROM A CHECKOUT
+
+from mo_sql_parsing import parse, split_statements, parse_delimiters
+
+RUNS = 3  # BEST OF, FOR EACH SIZE
+LIMIT = 1.2  # LARGEST EXPONENT THAT IS NOT FLAGGED
+RECURSION_LIMIT = 50_000  # THE DEEPEST subquery RECURSES PAST THE DEFAULT 1000
+
+
+def in_list(n):
+    return f"SELECT a FROM t WHERE a IN ({', '.join(str(i) for i in range(n))})"
+
+
+def and_or(n):
+    terms = [f"a{i} = {i}" for i in range(n)]
+    return "SELECT a FROM t WHERE " + "".join(
+        t + (" AND " if i % 2 else " OR ") for i, t in enumerate(terms[:-1])
+    ) + terms[-1]
+
+
+def subquery(n):
+    sql = "SELECT a FROM t"
+    for i in range(n):
+        sql = f"SELECT a FROM ({sql}) AS s{i}"
+    return sql
+
+
+def joins(n):
+    return "SELECT t0.a FROM t0" + "".join(f" JOIN t{i} ON t{i}.a = t{i - 1}.a" for i in range(1, n + 1))
+
+
+def ctes(n):
+    withs = ["c0 AS (SELECT a FROM t)"] + [f"c{i} AS (SELECT a FROM c{i - 1})" for i in range(1, n)]
+    return f"WITH {', '.join(withs)} SELECT a FROM c{n - 1}"
+
+
+def select_width(n):
+    return f"SELECT {', '.join(f'a{i}' for i in range(n))} FROM t"
+
+
+def case_branches(n):
+    whens = " ".join(f"WHEN a = {i} THEN 'v{i}'" for i in range(n))
+    return f"SELECT CASE {whens} ELSE 'other' END AS b FROM t"
+
+
+def union_all(n):
+    return " UNION ALL ".join(f"SELECT a, {i} AS b FROM t{i}" for i in range(n))
+
+
+def string_literal(n):
+    chunk = "abcdefghijklmn''"  # 16 CHARACTERS, WITH AN ESCAPED QUOTE
+    return f"SELECT '{chunk * (n // len(chunk))}' AS a FROM t"
+
+
+def statements(n):
+    return ";\n".join(f"SELECT a FROM t WHERE b = '{i};'" for i in range(n))
+
+
+def delimiters(n):
+    # EVERY TENTH STATEMENT CHANGES THE DELIMITER
+    lines = []
+    for i in range(n):
+        delimiter = "//" if (i // 10) % 2 else ";"
+        if not i % 10:
+            lines.append(f"DELIMITER {delimiter}")
+        lines.append(f"SELECT a FROM t WHERE b = {i} {delimiter}")
+    return "\n".join(lines)
+
+
+def split_delimiters(sql):
+    return list(parse_delimiters(sql, ignore=None))
+
+
+AXES = {
+    # NAME: (GENERATOR, SIZES, FUNCTION TIMED)
+    "in_list": (in_list, [2000, 4000, 8000, 16000, 32000], parse),
+    "and_or": (and_or, [100, 200, 400, 800, 1600], parse),
+    "subquery": (subquery, [8, 16, 32, 64, 128], parse),
+    "joins": (joins, [10, 20, 40, 80, 160], parse),
+    "ctes": (ctes, [10, 20, 40, 80, 160], parse),
+    "select_width": (select_width, [100, 200, 400, 800, 1600], parse),
+    "case_branches": (case_branches, [50, 100, 200, 400, 800], parse),
+    "union_all": (union_all, [25, 50, 100, 200, 400], parse),
+    "string_literal": (string_literal, [16_000, 32_000, 64_000, 128_000, 256_000], parse),
+    "statements": (statements, [2000, 4000, 8000, 16000, 32000], split_statements),
+    "delimiters": (delimiters, [4000, 8000, 16000, 32000, 64000], split_delimiters),
+}
+
+
+def best_time(func, sql, collect):
+    """
+    :param collect: True to leave the garbage collector on while timing
+    :return: best seconds of RUNS
+    """
+    timing = []
+    for _ in range(RUNS):
+        gc.collect()
+        if not collect:
+            gc.disable()
+        try:
+            start = perf_counter()
+            func(sql)
+            timing.append(perf_counter() - start)
+        finally:
+            gc.enable()
+    return min(timing)
+
+
+def exponent(sizes, times):
+    """
+    :return: k, the least squares fit of times = c * sizes**k
+    """
+    xs = [log(n) for n in sizes]
+    ys = [log(t) for t in times]
+    mx, my = sum(xs) / len(xs), sum(ys) / len(ys)
+    return sum((x - mx) * (y - my) for x, y in zip(xs, ys)) / sum((x - mx) ** 2 for x in xs)
+
+
+def main(axes):
+    parse("select 1")  # BUILD THE GRAMMAR FIRST
+    sys.setrecursionlimit(max(sys.getrecursionlimit(), RECURSION_LIMIT))
+    flagged = []
+    for name in axes:
+        generate, sizes, func = AXES[name]
+        times, gc_times = [], []
+        for n in sizes:
+            sql = generate(n)
+            elapsed = best_time(func, sql, False)
+            gc_elapsed = best_time(func, sql, True)
+            times.append(elapsed)
+            gc_times.append(gc_elapsed)
+            print(
+                f"{name:15} {n:>9,}: {elapsed * 1000:10.1f} ms  {elapsed * 1000_000 / n:8.2f} us/n"
+                f"  {gc_elapsed * 1000:10.1f} ms with gc"
+            )
+        k = exponent(sizes, gc_times)
+        verdict = "OK" if k <= LIMIT else "SUPERLINEAR"
+        print(f"{name:15} grows as n^{k:.2f}, n^{exponent(sizes, times):.2f} without gc (limit n^{LIMIT}) {verdict}")
+        if k > LIMIT:
+            flagged.append(name)
+    if flagged:
+        print(f"worse than n^{LIMIT}: {', '.join(flagged)}")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:] or list(AXES)))
@@ -0,0 +1,75 @@
+# encoding: utf-8
+#
+# This Source Code Form is subject to the terms of the Mozilla Public
+# License, v. 2.0. If a copy of the MPL was not distributed with this file,
+# You can obtain one at http://mozilla.org/MPL/2.0/.
+#
+# Author: Kyle Lahnakoski (kyle@lahnakoski.com)
+#
+from threading import Thread
+from time import perf_counter
+from unittest import TestCase
+
+from mo_sql_parsing import parse, parse_mysql, ParseBudgetExceeded
+from mo_sql_parsing.budget import Budget
+
+LIMITS = dict(max_seconds=2, max_steps=1000, max_depth=20)
+
+# KNOWN TO TAKE MINUTES, OR OVERFLOW THE STACK, WITHOUT A BUDGET
+SLOW = [
+    "select " + "(" * 30 + "1",
+    "select " + "(" * 30 + "'abc",
+    "select * from t where a in (" + "(" * 30 + "1",
+    "select " + "case when (" * 30 + "1",
+    "select " + "f(" * 500 + "1" + ")" * 500,
+    "select " + "cast(" * 300 + "1" + " as int)" * 300,
+    "select * from " + "(select * from " * 200 + "t" + ") x" * 200,
+    "select interval '" + "1 day " * 2000 + "'",
+]
+
+
+class TestBudget(TestCase):
+    def test_slow_inputs_are_rejected(self):
+        parse("select 1")  # BUILD THE GRAMMAR FIRST
+        for sql in SLOW:
+            start = perf_counter()
+            with self.assertRaises(ParseBudgetExceeded, msg=sql[:40]):
+                parse(sql, **LIMITS)
+            self.assertLess(perf_counter() - start, LIMITS["max_seconds"] + 1, sql[:40])
+
+    def test_each_limit(self):
+        sql = "select " + "(" * 30 + "1"
+        for name, value in [("max_seconds", 0.1), ("max_steps", 100), ("max_depth", 10)]:
+            with self.assertRaises(ParseBudgetExceeded) as context:
+                parse(sql, **{name: value})
+            self.assertEqual(context.exception.limit, name)
+            self.assertEqual(context.exception.value, value)
+
+    def test_ordinary_sql_within_budget(self):
+        sql = "select a, count(*) from (select a from t where b in (1, 2) and c like 'x%') group by a"
+        self.assertEqual(parse(sql, **LIMITS), parse(sql))
+        self.assertEqual(parse_mysql(sql, **LIMITS), parse_mysql(sql))
+
+        # THE BUDGET IS PER CALL, AND DOES NOT LEAK INTO LATER CALLS
+        for _ in range(3):
+            parse(sql, max_steps=20)
+        with self.assertRaises(ParseBudgetExceeded):
+            parse(sql, max_steps=2)
+
+    def test_budget_is_per_thread(self):
+        sql = "select " + "f(" * 20 + "1" + ")" * 20
+        results = []
+
+        def unlimited():
+            results.append(parse(sql) is not None)
+
+        with Budget(max_depth=1):
+            # ANOTHER THREAD, PARSING WHILE THIS ONE HAS A BUDGET, DOES NOT SEE IT
+            thread = Thread(target=unlimited)
+            thread.start()
+            thread.join()
+        self.assertEqual(results, [True])
+
+    def test_bad_limit(self):
+        with self.assertRaises(Exception):
+            parse("select 1", max_steps=0)
@@ -0,0 +1,62 @@
+# encoding: utf-8
+#
+# This Source Code Form is subject to the terms of the Mozilla Public
+# License, v. 2.0. If a copy of the MPL was not distributed with this file,
+# You can obtain one at http://mozilla.org/MPL/2.0/.
+#
+# Author: Kyle Lahnakoski (kyle@lahnakoski.com)
+#
+from unittest import TestCase
+from unittest.mock import patch
+
+from mo_sql_parsing import bulk, parse, parse_mysql, normal_op
+
+
+def full_grammar(parser, sql, **kwargs):
+    with patch.object(bulk, "MIN_ROWS", float("inf")), patch.object(bulk, "MIN_ITEMS", float("inf")):
+        return parser(sql, **kwargs)
+
+
+def rows(template, count=40):
+    return ",".join(template.format(i=i + 1) for i in range(count))
+
+
+class TestBulkInsert(TestCase):
+    def test_same_as_grammar(self):
+        for sql in [
+            "INSERT INTO `t` VALUES " + rows("({i},'it''s {i}',{i}.5,1e3,\"dq\",TRUE,'a\\nb')") + ";",
+            "insert into s.t (a, `b`) values " + rows("({i}, 'x{i}')"),
+            "insert into t (a, b) values " + rows("( {i} , {i} )"),
+        ]:
+            for kwargs in [{}, {"calls": normal_op}, {"null": None}]:
+                self.assertIsNotNone(bulk.parse_insert(sql, lambda s: parse_mysql(s, **kwargs)))
+                self.assertEqual(parse_mysql(sql, **kwargs), full_grammar(parse_mysql, sql, **kwargs))
+
+    def test_fallback(self):
+        for sql in [
+            "insert into t values " + rows("({i}, 'a')") + ",(0, 'a')",
+            "insert into t values " + rows("({i}, 'a')") + ",(-1, 'a')",
+            "insert into t values " + rows("({i}, 'a')") + ",(null, 'a')",
+            "insert into t values " + rows("({i}, 'a')") + ",(1, 2, 3)",
+            "insert into t values " + rows("({i}, \"a\")"),
+            "insert into t (a) values " + rows("({i})"),
+            "insert into t select 1 union all values " + rows("({i}, 'a')"),
+        ]:
+            self.assertEqual(parse(sql), full_grammar(parse, sql))
+
+    def test_errors(self):
+        sql = "insert into t values " + rows("({i}, 'a')") + " where"
+        with self.assertRaises(Exception):
+            parse(sql)
+
+    def test_in_list(self):
+        for sql in [
+            "select a from t where a in (" + rows("{i}") + ")",
+            "select a from t where a not in (" + rows("'it''s {i}'") + ", '')",
+            "select a from t where a in (" + rows("{i}.5") + ", 1e3, 0)",
+            "select a from t where a in (" + rows("{i}") + ", -1)",
+            "select a from t where a in (" + rows("{i}") + ", /* c */ 2)",
+            "select a from t where a in (" + rows("{i}") + ", 'x') and b = 2",
+        ]:
+            for kwargs in [{}, {"calls": normal_op}]:
+                self.assertEqual(parse(sql, **kwargs), full_grammar(parse, sql, **kwargs))
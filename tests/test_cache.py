@@ -0,0 +1,143 @@
+# encoding: utf-8
+#
+# This Source Code Form is subject to the terms of the Mozilla Public
+# License, v. 2.0. If a copy of the MPL was not distributed with this file,
+# You can obtain one at http://mozilla.org/MPL/2.0/.
+#
+# Author: Kyle Lahnakoski (kyle@lahnakoski.com)
+#
+from unittest import TestCase
+
+from mo_sql_parsing import parse, parse_mysql, enable_cache, disable_cache, normal_op
+
+
+class TestCache(TestCase):
+    def setUp(self):
+        self.cache = enable_cache(2)
+
+    def tearDown(self):
+        disable_cache()
+
+    def test_hit_and_miss(self):
+        sql = "select a from b where c is null"
+        first = parse(sql)
+        second = parse(sql)
+        self.assertEqual(first, second)
+        self.assertEqual(self.cache.stats, {"size": 1, "hits": 1, "misses": 1, "evictions": 0})
+
+    def test_cached_tree_is_not_shared(self):
+        sql = "select a, b from t"
+        first = parse(sql)
+        first["select"].append("corrupt")
+        first["from"] = "corrupt"
+        self.assertEqual(parse(sql), {"select": [{"value": "a"}, {"value": "b"}], "from": "t"})
+
+    def test_options_are_part_of_key(self):
+        sql = "select null, count(a) from t"
+        self.assertEqual(parse(sql), {"select": [{"value": {"null": {}}}, {"value": {"count": "a"}}], "from": "t"})
+        self.assertEqual(parse(sql, null=None), {"select": [{"value": None}, {"value": {"count": "a"}}], "from": "t"})
+        self.assertEqual(
+            parse(sql, calls=normal_op),
+            {"select": [{"value": {"null": {}}}, {"value": {"op": "count", "args": ["a"]}}], "from": "t"},
+        )
+        self.assertEqual(
+            parse(sql, fmap={"count": "cnt"}),
+            {"select": [{"value": {"null": {}}}, {"value": {"cnt": "a"}}], "from": "t"},
+        )
+        self.assertEqual(self.cache.hits, 0)
+
+    def test_null_type_is_part_of_key(self):
+        # 1 == 1.0 == True, BUT EACH IS A DIFFERENT null
+        sql = "select null from t"
+        for null in [1, True, 1.0]:
+            value = parse(sql, null=null)["select"]["value"]
+            self.assertIs(type(value), type(null))
+        self.assertEqual(self.cache.hits, 0)
+
+    def test_dialect_is_part_of_key(self):
+        sql = 'select "a"'
+        self.assertEqual(parse(sql), {"select": {"value": "a"}})
+        self.assertEqual(parse_mysql(sql), {"select": {"value": {"literal": "a"}}})
+
+    def test_lru_eviction(self):
+        parse("select 1")
+        parse("select 2")
+        parse("select 1")  # HIT, MAKES "select 2" THE OLDEST
+        parse("select 3")
+        self.assertEqual(self.cache.evictions, 1)
+        parse("select 1")
+        self.assertEqual(self.cache.hits, 2)
+        parse("select 2")
+        self.assertEqual(self.cache.misses, 4)
+
+    def test_errors_are_not_cached(self):
+        for _ in range(2):
+            with self.assertRaises(Exception):
+                parse("select from where")
+        self.assertEqual(len(self.cache), 0)
+
+
+class TestTemplateCache(TestCase):
+    def setUp(self):
+        self.cache = enable_cache(10, templates=True)
+
+    def tearDown(self):
+        disable_cache()
+
+    def test_literals_are_rebound(self):
+        for i in range(1, 5):
+            sql = f"select a, 'n{i}' from t where id = {i} and b > -{i}.5"
+            expected = {
+                "select": [{"value": "a"}, {"value": {"literal": f"n{i}"}}],
+                "from": "t",
+                "where": {"and": [{"eq": ["id", i]}, {"gt": ["b", -(i + 0.5)]}]},
+            }
+            self.assertEqual(parse(sql), expected)
+        self.assertEqual(self.cache.stats, {"size": 1, "hits": 3, "misses": 1, "evictions": 0})
+
+    def test_in_lists_of_any_length(self):
+        for n in range(2, 6):
+            numbers = list(range(1, n + 1))
+            names = [f"x{i}" for i in numbers]
+            quoted = ", ".join(f"'{n}'" for n in names)
+            sql = f"select a from t where b in ({', '.join(map(str, numbers))}) and c in ({quoted})"
+            expected = {
+                "select": {"value": "a"},
+                "from": "t",
+                "where": {"and": [{"in": ["b", numbers]}, {"in": ["c", {"literal": names}]}]},
+            }
+            self.assertEqual(parse(sql), expected)
+        self.assertEqual(self.cache.hits, 3)
+
+    def test_falsy_literals_change_shape(self):
+        self.assertEqual(
+            parse("insert into t values (1, 'a'), (2, 'b')"), {"insert": "t", "values": [[1, "a"], [2, "b"]]},
+        )
+        self.assertEqual(
+            parse("insert into t values (0, ''), (2, 'b')"),
+            {
+                "insert": "t",
+                "query": {"union_all": [
+                    {"select": [{"value": 0}, {"value": {"literal": ""}}]},
+                    {"select": [{"value": 2}, {"value": {"literal": "b"}}]},
+                ]},
+            },
+        )
+        self.assertEqual(self.cache.hits, 0)
+
+    def test_interval_is_not_templated(self):
+        self.assertEqual(parse("select interval '1 day'"), {"select": {"value": {"interval": [1, "day"]}}})
+        self.assertEqual(parse("select interval '2 hours'"), {"select": {"value": {"interval": [2, "hour"]}}})
+        self.assertEqual(self.cache.hits, 0)
+
+    def test_literals_the_lexer_rejects(self):
+        # THE GRAMMAR, NOT THE TEMPLATE LEXER, DECIDES WHAT IS AN ERROR
+        for sql in ["select 'a\\'", "select 1e400 from t where b = 'c'"]:
+            disable_cache()
+            with self.assertRaises(Exception) as expected:
+                parse_mysql(sql)
+            self.cache = enable_cache(10, templates=True)
+            with self.assertRaises(Exception) as cached:
+                parse_mysql(sql)
+            self.assertIs(type(cached.exception), type(expected.exception))
+            self.assertNotIsInstance(cached.exception, (SyntaxError, OverflowError))
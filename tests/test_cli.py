@@ -0,0 +1,114 @@
+# encoding: utf-8
+#
+# This Source Code Form is subject to the terms of the Mozilla Public
+# License, v. 2.0. If a copy of the MPL was not distributed with this file,
+# You can obtain one at http://mozilla.org/MPL/2.0/.
+#
+# Author: Kyle Lahnakoski (kyle@lahnakoski.com)
+#
+import gzip
+import json
+import os
+from io import BytesIO, StringIO
+from tempfile import TemporaryDirectory
+from unittest import TestCase
+
+import zstandard
+
+from mo_sql_parsing import parse, parse_mysql
+from mo_sql_parsing.__main__ import read_statements, run
+
+SCRIPT = """select 'ünïcödé' from t;
+select from where;
+-- only a comment;
+DELIMITER $$
+CREATE PROCEDURE p() BEGIN select 1; END $$
+DELIMITER ;
+select 2
+""".encode("utf8")
+
+
+def run_lines(names, **kwargs):
+    output = StringIO()
+    run(names, output=output, **kwargs)
+    return [json.loads(line) for line in output.getvalue().splitlines()]
+
+
+class TestCli(TestCase):
+    def setUp(self):
+        self.temp = TemporaryDirectory()
+        self.plain = os.path.join(self.temp.name, "log.sql")
+        with open(self.plain, "wb") as file:
+            file.write(SCRIPT)
+
+    def tearDown(self):
+        self.temp.cleanup()
+
+    def test_one_line_per_statement(self):
+        result = run_lines([self.plain], dialect="mysql")
+        self.assertEqual([r["index"] for r in result], list(range(6)))
+        self.assertEqual(result[0]["tree"], parse_mysql("select 'ünïcödé' from t"))
+        self.assertIn("where", result[1]["error"])
+        self.assertEqual(result[2]["tree"], {"delimiter": "$$"})
+        self.assertEqual(result[5]["tree"], parse_mysql("select 2"))
+        for r in result:
+            self.assertEqual(r["file"], self.plain)
+            self.assertGreaterEqual(r["seconds"], 0)
+
+    def test_byte_offsets(self):
+        result = run_lines([self.plain], dialect="mysql")
+        self.assertEqual(result[0]["offset"], 0)
+        self.assertEqual(result[1]["offset"], SCRIPT.index(b"select from"))
+        self.assertEqual(result[3]["offset"], SCRIPT.index(b"CREATE"))
+        self.assertEqual(result[5]["offset"], SCRIPT.index(b"select 2"))
+
+    def test_compressed(self):
+        zipped = os.path.join(self.temp.name, "log.sql.gz")
+        with gzip.open(zipped, "wb") as file:
+            file.write(SCRIPT)
+        zstd = os.path.join(self.temp.name, "log.zst")
+        with open(zstd, "wb") as file:
+            compressor = zstandard.ZstdCompressor()
+            file.write(compressor.compress(SCRIPT[:100]) + compressor.compress(SCRIPT[100:]))
+
+        expected = run_lines([self.plain], dialect="mysql")
+        for name in [zipped, zstd]:
+            result = run_lines([name], dialect="mysql")
+            for r in result:
+                del r["seconds"]
+                r["file"] = self.plain
+            self.assertEqual(result, [{k: v for k, v in r.items() if k != "seconds"} for r in expected])
+
+    def test_workers_keep_order(self):
+        sqls = "".join(f"select a{i} from t where b = {i};\n" for i in range(50))
+        with open(self.plain, "w") as file:
+            file.write(sqls)
+        result = run_lines([self.plain, self.plain], workers=2, batch_size=3, window=2)
+        self.assertEqual([r["index"] for r in result], list(range(100)))
+        self.assertEqual([r["tree"] for r in result], [parse(f"select a{i} from t where b = {i}") for i in range(50)] * 2)
+
+    def test_begin_is_one_statement(self):
+        with open(self.plain, "w") as file:
+            file.write("select 1; BEGIN ISOLATION LEVEL SERIALIZABLE; select 2; select 3;")
+        result = run_lines([self.plain])
+        self.assertEqual(len(result), 4)
+        self.assertIn("error", result[1])
+        self.assertEqual([r["tree"] for r in result[2:]], [parse("select 2"), parse("select 3")])
+
+    def test_long_statement_is_skipped(self):
+        with open(self.plain, "w") as file:
+            file.write("select 1; select 'never closed " + "x" * 1000 + "\n")
+        result = run_lines([self.plain], max_size=100)
+        self.assertEqual(result[0]["tree"], parse("select 1"))
+        self.assertIn("over 100 characters", result[1]["error"])
+        self.assertEqual(result[1]["offset"], 10)
+
+    def test_small_chunks(self):
+        # A CHUNK MAY END INSIDE AN ESCAPE, A COMMENT CLOSER, OR A UTF8 CHARACTER
+        data = "select 'it''s', 'ü'; /* a; **/ select 2; select '''', \"b\"\"; c\"; select 3;".encode("utf8")
+        expected = list(read_statements(BytesIO(data)))
+        self.assertEqual(len(expected), 4)
+        for start, sql in expected:
+            self.assertTrue(data[start:].decode("utf8").startswith(sql))
+        for size in range(1, len(data) + 1):
+            self.assertEqual(list(read_statements(BytesIO(data), chunk_size=size)), expected, f"chunks of {size}")
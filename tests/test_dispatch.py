@@ -0,0 +1,65 @@
+# encoding: utf-8
+#
+# This Source Code Form is subject to the terms of the Mozilla Public
+# License, v. 2.0. If a copy of the MPL was not distributed with this file,
+# You can obtain one at http://mozilla.org/MPL/2.0/.
+#
+# Author: Kyle Lahnakoski (kyle@lahnakoski.com)
+#
+from unittest import TestCase
+
+from mo_parsing import Empty
+
+from mo_sql_parsing import parse
+from mo_sql_parsing.dispatch import Unreserved
+from mo_sql_parsing.keywords import RESERVED
+
+
+class TestDispatch(TestCase):
+    def test_create_object(self):
+        result = parse("CREATE OR REPLACE TEMPORARY TABLE t (a int)")
+        expected = {"create table": {
+            "replace": True,
+            "temporary": True,
+            "name": "t",
+            "columns": {"name": "a", "type": {"int": {}}},
+        }}
+        self.assertEqual(result, expected)
+        self.assertEqual(parse("create schema s"), {"create_schema": {"name": "s"}})
+
+    def test_misleading_object(self):
+        # THE FIRST OBJECT WORD IS table, BUT THIS IS A VIEW
+        result = parse("create definer=table view v as select 1")
+        expected = {"create view": {"definer": "table", "name": "v", "query": {"select": {"value": 1}}}}
+        self.assertEqual(result, expected)
+
+    def test_same_error(self):
+        with self.assertRaises(Exception) as context:
+            parse("create unique index i on t (a)")
+        self.assertIn('Expecting {index} | {schema} | {trigger}, found "unique ind"', str(context.exception))
+
+    def test_compound_shortlist(self):
+        # A KEYWORD THAT IS ONLY THE START OF A WORD IS AN IDENTIFIER
+        result = parse("select (a), (select 1), truex, null")
+        expected = {"select": [
+            {"value": "a"},
+            {"value": {"select": {"value": 1}}},
+            {"value": "truex"},
+            {"value": {"null": {}}},
+        ]}
+        self.assertEqual(result, expected)
+
+    def test_reserved_words(self):
+        # EVERY WORD IN THE SET IS ONE RESERVED MATCHES ON ITS OWN
+        words = Unreserved(RESERVED.exprs, Empty()).words
+        self.assertIn("select", words)
+        for word in words:
+            RESERVED.parse_string(word.upper(), parse_all=True)
+
+        result = parse("select selected, fromage, union_x from t where t.from is null")
+        expected = {
+            "select": [{"value": "selected"}, {"value": "fromage"}, {"value": "union_x"}],
+            "from": "t",
+            "where": {"missing": "t.from"},
+        }
+        self.assertEqual(result, expected)
@@ -0,0 +1,67 @@
+# encoding: utf-8
+#
+# This Source Code Form is subject to the terms of the Mozilla Public
+# License, v. 2.0. If a copy of the MPL was not distributed with this file,
+# You can obtain one at http://mozilla.org/MPL/2.0/.
+#
+# Author: Kyle Lahnakoski (kyle@lahnakoski.com)
+#
+import json
+import os
+import re
+import subprocess
+import sys
+import tempfile
+from unittest import TestCase
+
+from mo_sql_parsing import parse_mysql
+from mo_sql_parsing.grammar_cache import SOURCE_MODULES
+
+# EXERCISES SENTINELS (null, RIGHT_ASSOC) AND CLOSURES IN THE GRAMMAR
+SQL = 'select -a, not b, "c", x is null from t where d between 1 and 2'
+
+PARSE_IN_CHILD = """
+import json, sys
+import mo_sql_parsing
+mo_sql_parsing.enable_grammar_cache(sys.argv[1])
+print(json.dumps(mo_sql_parsing.parse_mysql(sys.argv[2])))
+"""
+
+
+def parse_in_child(directory):
+    project = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    env = dict(os.environ, PYTHONPATH=os.pathsep.join([project, os.environ.get("PYTHONPATH", "")]))
+    output = subprocess.run(
+        [sys.executable, "-c", PARSE_IN_CHILD, directory, SQL], env=env, stdout=subprocess.PIPE, check=True,
+    ).stdout
+    return json.loads(output)
+
+
+class TestGrammarCache(TestCase):
+    def test_key_covers_the_grammar_source(self):
+        # A CHANGE TO ANY MODULE THE GRAMMAR IS BUILT FROM MUST MAKE A NEW KEY
+        directory = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "mo_sql_parsing")
+        with open(os.path.join(directory, "sql_parser.py")) as file:
+            imported = set(re.findall(r"^from mo_sql_parsing\.(\w+) import", file.read(), re.MULTILINE))
+        self.assertEqual(imported - set(SOURCE_MODULES), set())
+
+    def test_loaded_grammar_parses_the_same(self):
+        with tempfile.TemporaryDirectory() as directory:
+            expected = parse_mysql(SQL)
+            self.assertEqual(parse_in_child(directory), expected)
+            files = os.listdir(directory)
+            self.assertEqual(len(files), 1)
+            self.assertTrue(files[0].startswith("mysql_parser-none-"))
+
+            # SECOND PROCESS LOADS THE FILE
+            self.assertEqual(parse_in_child(directory), expected)
+            self.assertEqual(os.listdir(directory), files)
+
+    def test_bad_file_is_rebuilt(self):
+        with tempfile.TemporaryDirectory() as directory:
+            parse_in_child(directory)
+            (filename,) = os.listdir(directory)
+            with open(os.path.join(directory, filename), "wb") as file:
+                file.write(b"not a grammar")
+            self.assertEqual(parse_in_child(directory), parse_mysql(SQL))
+            self.assertGreater(os.path.getsize(os.path.join(directory, filename)), 1000)
@@ -0,0 +1,55 @@
+# encoding: utf-8
+#
+# This Source Code Form is subject to the terms of the Mozilla Public
+# License, v. 2.0. If a copy of the MPL was not distributed with this file,
+# You can obtain one at http://mozilla.org/MPL/2.0/.
+#
+# Author: Kyle Lahnakoski (kyle@lahnakoski.com)
+#
+from unittest import TestCase
+
+from mo_sql_parsing import parse
+
+
+class TestInfix(TestCase):
+    def test_precedence(self):
+        result = parse("select a + b - c * d / e % f")
+        expected = {"select": {"value": {"sub": [
+            {"add": ["a", "b"]},
+            {"mod": [{"div": [{"mul": ["c", "d"]}, "e"]}, "f"]},
+        ]}}}
+        self.assertEqual(result, expected)
+
+        result = parse("select a and b or c and not d between 1 and 2")
+        expected = {"select": {"value": {"or": [
+            {"and": ["a", "b"]},
+            {"and": ["c", {"not": {"between": ["d", 1, 2]}}]},
+        ]}}}
+        self.assertEqual(result, expected)
+
+    def test_prefix_after_operator(self):
+        self.assertEqual(parse("select a = not b"), {"select": {"value": {"eq": ["a", {"not": "b"}]}}})
+        self.assertEqual(parse("select x * ~1 = c"), {"select": {"value": {"eq": [{"mul": ["x", {"binary_not": 1}]}, "c"]}}})
+        self.assertEqual(parse("select - not a"), {"select": {"value": {"neg": {"not": "a"}}}})
+
+    def test_suffix(self):
+        result = parse("select -x::int + 1")
+        expected = {"select": {"value": {"add": [{"neg": {"cast": ["x", {"int": {}}]}}, 1]}}}
+        self.assertEqual(result, expected)
+
+    def test_long_chain(self):
+        terms = [f"x{i}" for i in range(2000)]
+        result = parse("select " + " + ".join(terms))
+        self.assertEqual(result, {"select": {"value": {"add": terms}}})
+
+        result = parse("select a from t where (a = 1 or b = 2) or " + " or ".join(f"{t} = 0" for t in terms))
+        expected = [{"eq": ["a", 1]}, {"eq": ["b", 2]}, *({"eq": [t, 0]} for t in terms)]
+        self.assertEqual(result["where"], {"or": expected})
+
+    def test_parenthesized_chain_is_not_grown(self):
+        result = parse("select ((a + b) + c) + d, (a + b) + c between (a + b) and 3")
+        expected = [
+            {"value": {"add": ["a", "b", "c", "d"]}},
+            {"value": {"between": [{"add": ["a", "b", "c"]}, {"add": ["a", "b"]}, 3]}},
+        ]
+        self.assertEqual(result, {"select": expected})
@@ -0,0 +1,65 @@
+# encoding: utf-8
+#
+# This Source Code Form is subject to the terms of the Mozilla Public
+# License, v. 2.0. If a copy of the MPL was not distributed with this file,
+# You can obtain one at http://mozilla.org/MPL/2.0/.
+#
+# Author: Kyle Lahnakoski (kyle@lahnakoski.com)
+#
+from unittest import TestCase
+
+from mo_sql_parsing import parse, parse_sqlserver, tokenize
+
+
+def texts(sql, dialect=None):
+    return [(kind, sql[start:end]) for kind, start, end in tokenize(sql, dialect)]
+
+
+class TestLexer(TestCase):
+    def test_tokens(self):
+        sql = "select a.b, N'it''s', 1.5e3, 0x1F, x::int -- note\n from t # more\n where a<=>b /* c */ and c->>'k'"
+        self.assertEqual(
+            texts(sql),
+            [
+                ("word", "select"), ("word", "a"), ("symbol", "."), ("word", "b"), ("symbol", ","),
+                ("string", "N'it''s'"), ("symbol", ","), ("number", "1.5e3"), ("symbol", ","),
+                ("number", "0x1F"), ("symbol", ","), ("word", "x"), ("symbol", "::"), ("word", "int"),
+                ("word", "from"), ("word", "t"), ("word", "where"), ("word", "a"), ("symbol", "<=>"),
+                ("word", "b"), ("word", "and"), ("word", "c"), ("symbol", "->>"), ("string", "'k'"),
+            ],
+        )
+
+    def test_dialect_quoting(self):
+        sql = 'select "a b", `c`, [d]'
+        self.assertEqual(texts(sql)[1:4:2], [("identifier", '"a b"'), ("identifier", "`c`")])
+        self.assertEqual(texts(sql, "mysql")[1:6:2], [("string", '"a b"'), ("identifier", "`c`"), ("identifier", "[d]")])
+        self.assertEqual(texts(sql, "sqlserver")[5], ("identifier", "[d]"))
+        self.assertEqual(texts(sql, "bigquery")[5:], [("symbol", "["), ("word", "d"), ("symbol", "]")])
+        with self.assertRaises(Exception):
+            tokenize(sql, "oracle")
+
+    def test_unterminated(self):
+        self.assertEqual(texts("select 'abc"), [("word", "select"), ("string", "'abc")])
+        self.assertEqual(texts("select 1 /* open"), [("word", "select"), ("number", "1")])
+
+    def test_comments_same_as_parser(self):
+        sql = "/* a */ select -- b\n x /* c\n d */ # e\n from t /* f */"
+        self.assertEqual(texts(sql), [("word", "select"), ("word", "x"), ("word", "from"), ("word", "t")])
+        self.assertEqual(parse(sql), {"select": {"value": "x"}, "from": "t"})
+        # A BLOCK COMMENT ENDS AT THE FIRST */, THEY DO NOT NEST
+        with self.assertRaises(Exception):
+            parse("select x /* a /* b */ */")
+        # THE LEXER RUNS AN UNTERMINATED COMMENT TO THE END, THE PARSER REFUSES IT
+        with self.assertRaises(Exception):
+            parse("select x /* open")
+
+    def test_sqlserver_comments(self):
+        # NO # COMMENTS, AND BLOCK COMMENTS NEST
+        sql = "select x /* a /* b */ c */ from t"
+        self.assertEqual(texts(sql, "sqlserver"), [("word", "select"), ("word", "x"), ("word", "from"), ("word", "t")])
+        self.assertEqual(parse_sqlserver(sql), {"select": {"value": "x"}, "from": "t"})
+        self.assertEqual(texts("x # y", "sqlserver"), [("word", "x"), ("symbol", "#"), ("word", "y")])
+        with self.assertRaises(Exception):
+            parse_sqlserver("select x from t # y")
+        with self.assertRaises(Exception):
+            parse_sqlserver("select x /* a /* b */ from t")
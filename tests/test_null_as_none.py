@@ -89,3 +89,22 @@ class TestNull(TestCase):
         result = parse(sql, null=None)
         expected = {"select": {"value": {"decode": ["A", None, {"literal": "b"}]}}}
         self.assertEqual(result, expected)
+
+    def test_null_everywhere(self):
+        # NULL AS A VALUE, A LIST ITEM, AND A FUNCTION PARAMETER
+        result = parse("select coalesce(null, a), [null, 1], null as n from t where b = null", null="N")
+        expected = {
+            "select": [
+                {"value": {"coalesce": ["N", "a"]}},
+                {"value": {"create_array": ["N", 1]}},
+                {"value": "N", "name": "n"},
+            ],
+            "from": "t",
+            "where": {"missing": "b"},
+        }
+        self.assertEqual(result, expected)
+
+    def test_null_parameter_with_fmap(self):
+        result = parse("select upper(null) from t", null=None, fmap={"upper": "up"})
+        expected = {"select": {"value": {"up": None}}, "from": "t"}
+        self.assertEqual(result, expected)
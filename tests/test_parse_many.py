@@ -0,0 +1,35 @@
+# encoding: utf-8
+#
+# This Source Code Form is subject to the terms of the Mozilla Public
+# License, v. 2.0. If a copy of the MPL was not distributed with this file,
+# You can obtain one at http://mozilla.org/MPL/2.0/.
+#
+# Author: Kyle Lahnakoski (kyle@lahnakoski.com)
+#
+from unittest import TestCase
+
+from mo_sql_parsing import parse_many, parse, parse_mysql, normal_op
+
+
+class TestParseMany(TestCase):
+    def test_order_is_kept(self):
+        sqls = [f"select a{i} from t where b = {i}" for i in range(100)]
+        result = parse_many(sqls, workers=2, chunksize=7)
+        self.assertEqual(result, [parse(sql) for sql in sqls])
+
+    def test_errors_are_values(self):
+        result = parse_many(["select a from b", "select from where", "select 1"], workers=2)
+        self.assertEqual(result[0], {"select": {"value": "a"}, "from": "b"})
+        self.assertIsInstance(result[1], Exception)
+        self.assertIn("where", str(result[1]))
+        self.assertEqual(result[2], {"select": {"value": 1}})
+
+    def test_options(self):
+        sql = 'select "a", null from t where c is null'
+        expected = parse_mysql(sql, null=None, calls=normal_op)
+        self.assertEqual(parse_many([sql], dialect="mysql", workers=2, null=None, calls=normal_op), [expected])
+        self.assertEqual(parse_many([sql], dialect="mysql", workers=1, null=None, calls=normal_op), [expected])
+
+    def test_unknown_dialect(self):
+        with self.assertRaises(Exception):
+            parse_many(["select 1"], dialect="cobol")
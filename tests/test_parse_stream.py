@@ -0,0 +1,72 @@
+# encoding: utf-8
+#
+# This Source Code Form is subject to the terms of the Mozilla Public
+# License, v. 2.0. If a copy of the MPL was not distributed with this file,
+# You can obtain one at http://mozilla.org/MPL/2.0/.
+#
+# Author: Kyle Lahnakoski (kyle@lahnakoski.com)
+#
+import os
+from io import BytesIO
+from unittest import TestCase
+
+from mo_sql_parsing import parse, parse_mysql, parse_stream, parse_delimiters
+
+ISSUE_218 = os.path.join(os.path.dirname(__file__), "mysql", "issue_218.sql")
+
+SCRIPT = """
+select 'a;b', "c;d" from t; -- comment; here
+/* block; comment */ select 2;;
+DELIMITER $$
+CREATE PROCEDURE p(IN a INT) BEGIN select 1; select case when a then 1 end; END $$
+DELIMITER ;
+CREATE TRIGGER t AFTER INSERT ON f FOR EACH ROW BEGIN insert into x values (1); END;
+select 'ünïcödé'
+"""
+
+
+class TestParseStream(TestCase):
+    def test_pieces_of_any_size(self):
+        expected = list(parse_stream(SCRIPT, dialect="mysql"))
+        self.assertEqual(
+            [tree for _, _, tree in expected],
+            [
+                parse_mysql("select 'a;b', \"c;d\" from t"),
+                parse_mysql("select 2"),
+                {"delimiter": "$$"},
+                parse_mysql("CREATE PROCEDURE p(IN a INT) BEGIN select 1; select case when a then 1 end; END"),
+                {"delimiter": ";"},
+                parse_mysql("CREATE TRIGGER t AFTER INSERT ON f FOR EACH ROW BEGIN insert into x values (1); END"),
+                parse_mysql("select 'ünïcödé'"),
+            ],
+        )
+        self.assertEqual([i for i, _, _ in expected], list(range(7)))
+        for size in [1, 2, 3, 7, 64]:
+            pieces = [SCRIPT[i : i + size] for i in range(0, len(SCRIPT), size)]
+            self.assertEqual(list(parse_stream(pieces, dialect="mysql")), expected)
+
+    def test_spans(self):
+        for _, (start, end), tree in parse_stream(SCRIPT, dialect="mysql"):
+            if "delimiter" not in tree:
+                self.assertEqual(parse_mysql(SCRIPT[start:end]), tree)
+
+    def test_binary_file(self):
+        data = SCRIPT.encode("utf8")
+        self.assertEqual(
+            list(parse_stream(BytesIO(data), dialect="mysql", chunk_size=5)), list(parse_stream(SCRIPT, dialect="mysql")),
+        )
+
+    def test_same_as_parse_delimiters(self):
+        with open(ISSUE_218) as file:
+            content = file.read()
+        expected = [parse(block) for block in parse_delimiters(content, ignore=None)]
+        expected = [tree for tree in expected if tree is not None]
+        with open(ISSUE_218) as file:
+            result = [tree for _, _, tree in parse_stream(file, chunk_size=100)]
+        self.assertEqual(result, expected)
+
+    def test_errors_are_values(self):
+        result = list(parse_stream("select 1; select from where; select 3"))
+        self.assertEqual(result[0], (0, (0, 8), {"select": {"value": 1}}))
+        self.assertIsInstance(result[1][2], Exception)
+        self.assertEqual(result[2], (2, (29, 37), {"select": {"value": 3}}))
@@ -0,0 +1,64 @@
+# encoding: utf-8
+#
+# This Source Code Form is subject to the terms of the Mozilla Public
+# License, v. 2.0. If a copy of the MPL was not distributed with this file,
+# You can obtain one at http://mozilla.org/MPL/2.0/.
+#
+# Author: Kyle Lahnakoski (kyle@lahnakoski.com)
+#
+import json
+from unittest import TestCase
+
+from mo_sql_parsing import parse, profile, enable_cache, disable_cache
+
+SQL = "select a, sum(b) from t where c > 1 and d in (select x from y) group by a order by 2"
+
+
+class TestProfile(TestCase):
+    def test_counts_named_rules(self):
+        expected = parse(SQL)
+        with profile() as p:
+            result = parse(SQL)
+        self.assertEqual(result, expected)
+
+        stats = {s["rule"]: s for s in p.stats}
+        self.assertEqual(stats["statement"]["attempts"], 1)
+        self.assertEqual(stats["query"]["matches"], 2)
+        self.assertGreater(stats["expression"]["attempts"], 2)
+        for s in p.stats:
+            self.assertEqual(s["attempts"], s["matches"] + s["failures"])
+            # RECURSIVE RULES ARE TIMED ONCE, SO NO RULE TAKES LONGER THAN THE WHOLE PARSE
+            self.assertLessEqual(s["seconds"], p.seconds)
+        self.assertEqual(p.stats[0]["seconds"], max(s["seconds"] for s in p.stats))
+
+        report = p.report(limit=5)
+        self.assertEqual(len(report.splitlines()), 7)
+        self.assertEqual(json.loads(p.to_json())["rules"], p.stats)
+
+    def test_profile_ends_with_block(self):
+        from mo_parsing.core import ParserElement
+
+        original = ParserElement._parse
+        with self.assertRaises(Exception):
+            with profile():
+                parse("select from")
+        self.assertIs(ParserElement._parse, original)
+
+        with profile() as p:
+            with self.assertRaises(Exception):
+                with profile():
+                    pass
+        parse(SQL)
+        self.assertEqual(p.stats, [])
+
+    def test_cache_hits(self):
+        enable_cache()
+        try:
+            parse(SQL)
+            with profile() as p:
+                parse(SQL)
+                parse(SQL)
+            self.assertEqual(p.cache_hits, 2)
+            self.assertEqual(p.stats, [])
+        finally:
+            disable_cache()
@@ -0,0 +1,98 @@
+# encoding: utf-8
+#
+# This Source Code Form is subject to the terms of the Mozilla Public
+# License, v. 2.0. If a copy of the MPL was not distributed with this file,
+# You can obtain one at http://mozilla.org/MPL/2.0/.
+#
+# Author: Kyle Lahnakoski (kyle@lahnakoski.com)
+#
+from unittest import TestCase
+
+from mo_sql_parsing import split_statements, parse_delimiters, delimiter_spans, tokenize
+from mo_sql_parsing.statements import StatementSplitter
+
+
+class TestSplitStatements(TestCase):
+    def test_quotes_and_comments(self):
+        sql = """select 'a;b', "c;d", `e;f` from t -- g;h
+        ; /* i;j */ select 2;; select 3"""
+        self.assertEqual(
+            split_statements(sql),
+            ["select 'a;b', \"c;d\", `e;f` from t -- g;h", "/* i;j */ select 2", "select 3"],
+        )
+
+    def test_blocks_and_delimiters(self):
+        sql = """
+        BEGIN TRANSACTION;
+        CREATE TRIGGER t AFTER INSERT ON f FOR EACH ROW BEGIN
+            IF new.a THEN insert into x values (case when a then 1 end); END IF;
+        END;
+        DELIMITER //
+        select 1; select 2 //
+        DELIMITER ;
+        COMMIT;
+        """
+        self.assertEqual(
+            split_statements(sql),
+            [
+                "BEGIN TRANSACTION",
+                "CREATE TRIGGER t AFTER INSERT ON f FOR EACH ROW BEGIN\n"
+                "            IF new.a THEN insert into x values (case when a then 1 end); END IF;\n"
+                "        END",
+                "DELIMITER //",
+                "select 1; select 2",
+                "DELIMITER ;",
+                "COMMIT",
+            ],
+        )
+
+    def test_delimiter_spans(self):
+        sql = "select 1;\nDELIMITER ;;\nselect 2;;\n  select 3 ;; \nDELIMITER ;\nselect 4; select 5"
+        spans = list(delimiter_spans(sql, ignore=None))
+        self.assertEqual([sql[s:e] for s, e in spans], list(parse_delimiters(sql, ignore=None)))
+        self.assertEqual(
+            [sql[s:e].strip() for s, e in spans],
+            ["select 1", "", "DELIMITER ;;", "select 2", "select 3", "", "DELIMITER ;", "select 4; select 5"],
+        )
+
+    def test_begin_outside_a_routine(self):
+        sql = "BEGIN ISOLATION LEVEL SERIALIZABLE;\nselect 1;\nCOMMIT;\nselect 2;"
+        self.assertEqual(split_statements(sql), ["BEGIN ISOLATION LEVEL SERIALIZABLE", "select 1", "COMMIT", "select 2"])
+
+    def test_dollar_and_bracket_quotes(self):
+        sql = "select $$a;b$$; select $x$ c;$$ d $x$; select [e;f] from t; select 4"
+        expected = ["select $$a;b$$", "select $x$ c;$$ d $x$", "select [e;f] from t", "select 4"]
+        self.assertEqual(split_statements(sql), expected)
+
+        splitter = StatementSplitter()
+        pieces = [s for c in sql for _, _, s in splitter.feed(c)]
+        pieces.extend(s for _, _, s in splitter.close())
+        self.assertEqual(pieces, expected)
+
+    def test_quotes_agree_with_tokenize(self):
+        # ]] IS AN ESCAPED ] IN A BRACKET QUOTE, FOR THE SPLITTER AND THE LEXER ALIKE
+        sql = "select [a]];b] from t; select 2"
+        self.assertEqual(split_statements(sql), ["select [a]];b] from t", "select 2"])
+        kind, start, end = tokenize(sql, "sqlserver")[1]
+        self.assertEqual((kind, sql[start:end]), ("identifier", "[a]];b]"))
+
+    def test_dollar_delimiter(self):
+        sql = "DELIMITER $$\nCREATE PROCEDURE p() BEGIN select 1; END $$\nDELIMITER ;\nselect 2"
+        self.assertEqual(
+            split_statements(sql),
+            ["DELIMITER $$", "CREATE PROCEDURE p() BEGIN select 1; END", "DELIMITER ;", "select 2"],
+        )
+
+    def test_pieces_of_every_size(self):
+        # A PIECE MAY END BETWEEN THE TWO QUOTES OF AN ESCAPE, OR THE TWO CHARACTERS OF A CLOSER
+        sql = (
+            "select 1;\nselect 'it''s', 'it\\''s;', 'a\\\\', \"c\"\"d;\", `e``f;`, [g]];h] from t; "
+            "/* /* i; **/ select $x$ j;$$ $x$; -- k;\nselect 'l'''; select ''''; select 3"
+        )
+        expected = split_statements(sql)
+        self.assertEqual(len(expected), 6)
+        for size in range(1, len(sql) + 1):
+            splitter = StatementSplitter()
+            result = [s for i in range(0, len(sql), size) for _, _, s in splitter.feed(sql[i : i + size])]
+            result.extend(s for _, _, s in splitter.close())
+            self.assertEqual(result, expected, f"pieces of {size}")
@@ -0,0 +1,67 @@
+# encoding: utf-8
+#
+# This Source Code Form is subject to the terms of the Mozilla Public
+# License, v. 2.0. If a copy of the MPL was not distributed with this file,
+# You can obtain one at http://mozilla.org/MPL/2.0/.
+#
+# Author: Kyle Lahnakoski (kyle@lahnakoski.com)
+#
+from concurrent.futures import ThreadPoolExecutor
+from unittest import TestCase
+
+from mo_parsing import core
+from mo_parsing.core import Parser
+
+from mo_sql_parsing import parse, normal_op, parse_mysql
+
+
+class TestThreads(TestCase):
+    def test_concurrent_parse_options_do_not_leak(self):
+        sqls = [f"select a{i}, null from t{i} where b = null or c in (1, {i})" for i in range(200)]
+        expected = [(parse(sql), parse(sql, null=None, calls=normal_op, fmap={"or": "any"})) for sql in sqls]
+
+        def both(sql):
+            return parse(sql), parse(sql, null=None, calls=normal_op, fmap={"or": "any"})
+
+        with ThreadPoolExecutor(8) as pool:
+            result = list(pool.map(both, sqls))
+        self.assertEqual(result, expected)
+
+    def test_concurrent_dialects(self):
+        sql = 'select "a", `b` from t where c is null'
+        expected = parse(sql), parse_mysql(sql)
+
+        def both(_):
+            return parse(sql), parse_mysql(sql)
+
+        with ThreadPoolExecutor(8) as pool:
+            result = list(pool.map(both, range(100)))
+        self.assertEqual(result, [expected] * 100)
+
+    def test_window_bounds_use_parse_options(self):
+        sql = "select sum(a) over (order by b range between x + 1 preceding and current row) from t"
+        self.assertEqual(
+            parse(sql, calls=normal_op)["select"]["over"]["range"],
+            {"min": {"neg": {"op": "add", "args": ["x", 1]}}, "max": 0},
+        )
+        self.assertEqual(
+            parse(sql, fmap={"add": "plus"})["select"]["over"]["range"],
+            {"min": {"neg": {"plus": ["x", 1]}}, "max": 0},
+        )
+
+        def both(_):
+            return parse(sql), parse(sql, calls=normal_op, fmap={"add": "plus"})
+
+        expected = both(None)
+        with ThreadPoolExecutor(8) as pool:
+            result = list(pool.map(both, range(100)))
+        self.assertEqual(result, [expected] * 100)
+
+    def test_mo_parsing_internals(self):
+        # parse() CALLS Parser._parseString() TO SKIP THE mo-parsing LOCK AND ITS RESET ACTIONS (SEE _parse());
+        # A NEW RESET ACTION IS NEW GLOBAL PARSE STATE, AND SKIPPING THE LOCK MUST BE CHECKED AGAIN
+        self.assertTrue(callable(getattr(Parser, "_parseString", None)))
+        self.assertLessEqual(
+            {f"{a.__module__}.{a.__name__}" for a in core._reset_actions},
+            {"mo_parsing.regex._reset", "mo_parsing.helpers.reset_stack"},
+        )
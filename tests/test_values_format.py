@@ -0,0 +1,73 @@
+# encoding: utf-8
+#
+# This Source Code Form is subject to the terms of the Mozilla Public
+# License, v. 2.0. If a copy of the MPL was not distributed with this file,
+# You can obtain one at http://mozilla.org/MPL/2.0/.
+#
+# Author: Kyle Lahnakoski (kyle@lahnakoski.com)
+#
+from unittest import TestCase, skipIf
+from unittest.mock import patch
+
+from mo_sql_parsing import bulk, parse, parse_mysql, normal_op
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+
+def plain(tree):
+    # NumPy ARRAYS TO LISTS, FOR COMPARISON
+    if isinstance(tree, dict):
+        return {k: plain(v) for k, v in tree.items()}
+    elif isinstance(tree, list):
+        return [plain(v) for v in tree]
+    elif hasattr(tree, "tolist"):
+        return tree.tolist()
+    return tree
+
+
+class TestValuesFormat(TestCase):
+    def test_columnar(self):
+        result = parse("insert into t (a, b, c) values (1, 'x', 2.5), (2, 'y', 3)", values_format="columnar")
+        self.assertEqual(
+            plain(result), {"insert": "t", "columns": ["a", "b", "c"], "values": {"a": [1, 2], "b": ["x", "y"], "c": [2.5, 3]}},
+        )
+        result = parse("insert into t values (1, 'x'), (2, 'y', 3)", values_format="columnar", calls=normal_op)
+        self.assertEqual(
+            plain(result), {"op": "insert", "args": ["t"], "kwargs": {"values": [[1, 2], ["x", "y"], [None, 3]]}},
+        )
+        # NOT A values FORM, SO NOTHING TO TRANSPOSE
+        sql = "insert into t (a, b) values (1, null), (2, 3)"
+        self.assertEqual(parse(sql, values_format="columnar"), parse(sql))
+        with self.assertRaises(Exception):
+            parse(sql, values_format="columns")
+        with self.assertRaises(Exception):
+            parse(sql, values_format="rows")
+
+    def test_bulk_insert(self):
+        sql = "INSERT INTO `t` (`id`, `name`) VALUES " + ",".join(f"({i + 1},'n{i}')" for i in range(100))
+        expected = {
+            "insert": "t",
+            "columns": ["id", "name"],
+            "values": {"id": list(range(1, 101)), "name": [f"n{i}" for i in range(100)]},
+        }
+        self.assertIsNotNone(bulk.parse_insert(sql, parse_mysql, columnar=True))
+        self.assertEqual(plain(parse_mysql(sql, values_format="columnar")), expected)
+        with patch.object(bulk, "MIN_ROWS", float("inf")):
+            self.assertEqual(plain(parse_mysql(sql, values_format="columnar")), expected)
+
+    @skipIf(numpy is None, "NumPy is not installed")
+    def test_numpy_arrays(self):
+        result = parse("insert into t (a, b, c) values (1, 'x', 2.5), (2, 'y', 3)", values_format="columnar")
+        self.assertEqual(result["values"]["a"].dtype, numpy.int64)
+        self.assertEqual(result["values"]["c"].dtype, numpy.float64)
+        self.assertEqual(result["values"]["b"], ["x", "y"])
+
+    @skipIf(numpy is not None, "NumPy is installed")
+    def test_lists_without_numpy(self):
+        result = parse("insert into t (a, b, c) values (1, 'x', 2.5), (2, 'y', 3)", values_format="columnar")
+        self.assertEqual(result["values"], {"a": [1, 2], "b": ["x", "y"], "c": [2.5, 3]})
+        for column in result["values"].values():
+            self.assertIs(type(column), list)
@@ -0,0 +1,32 @@
+# encoding: utf-8
+#
+# This Source Code Form is subject to the terms of the Mozilla Public
+# License, v. 2.0. If a copy of the MPL was not distributed with this file,
+# You can obtain one at http://mozilla.org/MPL/2.0/.
+#
+# Author: Kyle Lahnakoski (kyle@lahnakoski.com)
+#
+from unittest import TestCase
+
+import mo_sql_parsing
+from mo_sql_parsing import warmup, parse_bigquery
+
+
+class TestWarmup(TestCase):
+    def test_background(self):
+        done = warmup(["bigquery", "mysql"], all_columns=["*"])
+        self.assertEqual(done.result(timeout=60), [("bigquery", "*"), ("mysql", "*")])
+        self.assertIsNotNone(mo_sql_parsing.lookup_parsers["bigquery_parser"]["*"])
+        self.assertIsNotNone(mo_sql_parsing.lookup_parsers["mysql_parser"]["*"])
+        self.assertEqual(parse_bigquery("select a from b", all_columns="*"), {"select": {"value": "a"}, "from": "b"})
+
+    def test_foreground(self):
+        done = warmup(background=False)
+        self.assertTrue(done.done())
+        self.assertEqual(done.result(), [("common", None), ("common", "*")])
+
+    def test_bad_arguments(self):
+        with self.assertRaises(Exception):
+            warmup(["cobol"])
+        with self.assertRaises(Exception):
+            warmup(all_columns=["all"])